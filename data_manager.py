@@ -8,21 +8,30 @@ import json
 from typing import List, Dict, Tuple, Optional
 
 
+# Supported image extensions (lowercase, with leading dot)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
+
+
 class DataManager:
     """Manages image data, descriptions, and file operations"""
     
     def __init__(self):
         self.images_data: List[Dict] = []
         self.current_folder: Optional[str] = None
+        # filename -> position in images_data, so selection handling needs no list scans
+        self._index_by_filename: Dict[str, int] = {}
         
     @staticmethod
     def get_image_files(folder_path: str) -> List[str]:
         """Get all supported image files from a folder"""
-        image_extensions = ('.jpg', '.jpeg', '.png', '.webp')
         try:
-            return [f for f in os.listdir(folder_path) 
-                    if os.path.isfile(os.path.join(folder_path, f)) 
-                    and f.lower().endswith(image_extensions)]
+            image_files = []
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                        image_files.append(name)
+            return image_files
         except (OSError, FileNotFoundError):
             return []
     
@@ -71,6 +80,7 @@ class DataManager:
             # Store the data
             self.images_data = images_data
             self.current_folder = folder_path
+            self._index_by_filename = {img_data['filename']: i for i, img_data in enumerate(images_data)}
             
             message = f"Loaded {len(images_data)} images from {os.path.basename(folder_path)}"
             return True, message, images_data
@@ -140,6 +150,15 @@ class DataManager:
             return self.images_data[index]
         return None
     
+    def find_image_index(self, filename: str) -> int:
+        """Index of the image with this filename, or -1 if it isn't loaded"""
+        return self._index_by_filename.get(filename, -1)
+    
+    def find_image_by_filename(self, filename: str) -> Optional[Dict]:
+        """Get image data by filename"""
+        index = self._index_by_filename.get(filename, -1)
+        return self.images_data[index] if index >= 0 else None
+    
     def find_image_by_row_index(self, row: int) -> Tuple[int, Optional[Dict]]:
         """Find image data by table row index"""
         for i, img_data in enumerate(self.images_data):
@@ -151,9 +170,12 @@ class DataManager:
         """Remove image from the list"""
         if 0 <= index < len(self.images_data):
             del self.images_data[index]
-            # Update row indices for remaining images
+            # Update row indices and the filename lookup for remaining images
+            index_by_filename = {}
             for i, img_data in enumerate(self.images_data):
                 img_data['row_index'] = i
+                index_by_filename[img_data['filename']] = i
+            self._index_by_filename = index_by_filename
             return True
         return False
     
@@ -13,11 +13,12 @@ from PyQt6.QtWidgets import (
     QProgressDialog, QApplication, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QTextEdit, QScrollArea, QInputDialog, QWidget
 )
-from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtCore import Qt, QPoint, QThreadPool
 from PyQt6.QtGui import QPixmap, QImage, QBrush, QColor, QFont
 
 from PIL import Image
 from dialogs import ImageFixDialog, ImageDuplicateDialog
+from image_processor import ImageProcessor, ImageOpWorker
 
 
 class EventHandlers:
@@ -25,6 +26,9 @@ class EventHandlers:
     
     def __init__(self, app):
         self.app = app
+        # Background image operations run on a parentless processor, which never touches widgets
+        self._background_processor = ImageProcessor()
+        self._active_worker = None
     
     def select_folder(self):
         """Open file dialog to select a folder with images"""
@@ -76,16 +80,9 @@ class EventHandlers:
             display_name = f"📷 {img_data['filename']}"
             table.setItem(row_position, 0, QTableWidgetItem(display_name))
             
-            # Tags column
-            try:
-                tags = self.app.tag_manager.get_tags_for_image(img_data['filename'])
-                tag_widget = self._create_tag_display_widget(img_data['filename'], tags)
-                table.setCellWidget(row_position, 1, tag_widget)
-            except Exception as e:
-                print(f"Error creating tag widget for {img_data['filename']}: {e}")
-                tags = self.app.tag_manager.get_tags_for_image(img_data['filename'])
-                tag_text = ", ".join(tags) if tags else ""
-                table.setItem(row_position, 1, QTableWidgetItem(tag_text))
+            # Tags column (drawn as chips by the gallery tab's tag delegate)
+            tags = self.app.tag_manager.get_tags_for_image(img_data['filename'])
+            table.setItem(row_position, 1, self._create_tags_item(tags))
             
             # Set row data for selection handling
             table.item(row_position, 0).setData(Qt.ItemDataRole.UserRole, ('image', img_data['filename']))
@@ -93,6 +90,9 @@ class EventHandlers:
             # Update row index in data
             img_data['row_index'] = row_position
         
+        # Size rows to their chips; the delegate caches heights per tag set and width
+        self.app.gallery_tab.fit_tag_row_heights()
+        
         # Update utils tab scope info
         self.app.utils_tab.update_scope_info(0, len(images_data))
         
@@ -104,24 +104,18 @@ class EventHandlers:
                 
             if hasattr(self.app.gallery_tab, 'current_image_tags_widget'):
                 self.app.gallery_tab.current_image_tags_widget.set_tag_manager(self.app.tag_manager)
+            
+            if hasattr(self.app.gallery_tab, 'tag_delegate'):
+                self.app.gallery_tab.tag_delegate.set_tag_manager(self.app.tag_manager)
         except Exception as e:
             print(f"Warning: Could not update tag widgets: {e}")
     
-    def _create_tag_display_widget(self, filename: str, tags: list):
-        """Create a tag display widget for table cells"""
-        try:
-            from ui_components import TagDisplayWidget
-            
-            widget = TagDisplayWidget(filename, tags, tag_manager=self.app.tag_manager)
-            widget.tag_removed.connect(self.on_tag_removed_from_image)
-            widget.keyword_toggled.connect(self.on_keyword_toggled)
-            return widget
-        except Exception as e:
-            print(f"Error creating TagDisplayWidget for {filename}: {e}")
-            # Fallback to simple label with tag text
-            from PyQt6.QtWidgets import QLabel
-            label = QLabel(", ".join(tags) if tags else "No tags")
-            return label
+    def _create_tags_item(self, tags):
+        """Create the Tags column item; the text is kept for copy/fallback display"""
+        item = QTableWidgetItem(", ".join(tags))
+        item.setData(Qt.ItemDataRole.UserRole, tags)
+        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        return item
     
     def on_table_select(self):
         """Handle table selection change"""
@@ -139,7 +133,7 @@ class EventHandlers:
                 
                 if item_type == 'image':
                     # Individual image selected
-                    img_data = next((img for img in self.app.data_manager.images_data if img['filename'] == data), None)
+                    img_data = self.app.data_manager.find_image_by_filename(data)
                     if img_data:
                         selected_images.append(img_data)
         
@@ -161,7 +155,7 @@ class EventHandlers:
             # Single image selection - show the image
             img_data = selected_images[0]
             # Find the index in original data
-            self.app.current_image_index = next((i for i, img in enumerate(self.app.data_manager.images_data) if img['filename'] == img_data['filename']), -1)
+            self.app.current_image_index = self.app.data_manager.find_image_index(img_data['filename'])
             self.show_selected_image()
             self.app.set_status(f"Selected: {img_data['filename']}")
         else:
@@ -197,7 +191,7 @@ class EventHandlers:
                 
                 if item_type == 'image':
                     # Individual image selected
-                    img_data = next((img for img in self.app.data_manager.images_data if img['filename'] == data), None)
+                    img_data = self.app.data_manager.find_image_by_filename(data)
                     if img_data:
                         selected_images.append(img_data)
         
@@ -284,8 +278,8 @@ class EventHandlers:
     def _auto_save_tags(self):
         """Auto-save tags and sync with traditional descriptions"""
         try:
-            # Save tags to project
-            success, message = self.app.tag_manager.save_tags_to_project()
+            # Journal only what changed; tags.json is compacted when the journal grows
+            success, message = self.app.tag_manager.save_tag_changes()
             if not success:
                 self.app.set_status(f"Tag save failed: {message}")
                 return
@@ -330,9 +324,15 @@ class EventHandlers:
         """Handle keyword tag toggle"""
         self.app.tag_manager.toggle_keyword_tag(tag)
         
-        # Refresh all table rows to update keyword display
-        for img_data in self.app.data_manager.images_data:
-            self.refresh_image_row(img_data['filename'])
+        # Rebuild the Tags items so the keyword moves to the front of every row
+        table = self.app.gallery_tab.table
+        get_tags = self.app.tag_manager.get_tags_for_image
+        for row in range(table.rowCount()):
+            item = table.item(row, 0)
+            row_data = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if row_data and row_data[0] == 'image':
+                table.setItem(row, 1, self._create_tags_item(get_tags(row_data[1])))
+        self.app.gallery_tab.fit_tag_row_heights()
         
         # Update current image tags display if applicable
         if self.app.current_image_index >= 0:
@@ -345,10 +345,10 @@ class EventHandlers:
                 except Exception as e:
                     print(f"Error updating current image tags display: {e}")
         
-        # Update tag input widget display
+        # Update the keyword highlight in the tag input widget; only chip colors change
         try:
             if hasattr(self.app.gallery_tab, 'tag_input_widget'):
-                self.app.gallery_tab.tag_input_widget.refresh_tag_display()
+                self.app.gallery_tab.tag_input_widget.refresh_keyword_state()
         except Exception as e:
             print(f"Warning: Could not refresh tag input widget: {e}")
         
@@ -371,18 +371,10 @@ class EventHandlers:
             if item and item.data(Qt.ItemDataRole.UserRole):
                 item_type, data = item.data(Qt.ItemDataRole.UserRole)
                 if item_type == 'image' and data == filename:
-                    # Update the tags widget
+                    # Update the tags item; the delegate repaints the chips
                     tags = self.app.tag_manager.get_tags_for_image(filename)
-                    try:
-                        tag_widget = self._create_tag_display_widget(filename, tags)
-                        table.setCellWidget(row, 1, tag_widget)
-                    except Exception as e:
-                        print(f"Error refreshing tag widget for {filename}: {e}")
-                        # Fallback to text display
-                        tag_text = ", ".join(tags) if tags else ""
-                        # Remove existing widget first
-                        table.removeCellWidget(row, 1)
-                        table.setItem(row, 1, QTableWidgetItem(tag_text))
+                    table.setItem(row, 1, self._create_tags_item(tags))
+                    self.app.gallery_tab.fit_tag_row_heights((row,))
                     break
     
     def on_tags_changed(self, available_tags: list):
@@ -463,6 +455,20 @@ class EventHandlers:
         from PyQt6.QtWidgets import QMenu
         context_menu = QMenu()
         
+        # Offer keyword toggling when the click is on a tag chip
+        table = self.app.gallery_tab.table
+        index = table.indexAt(position)
+        if index.isValid() and index.column() == 1:
+            hit = self.app.gallery_tab.tag_delegate.tag_at(table.visualRect(index), index, position)
+            if hit is not None:
+                tag = hit[0]
+                if self.app.tag_manager.is_keyword_tag(tag):
+                    keyword_action = context_menu.addAction("🔴 Remove as Keyword")
+                else:
+                    keyword_action = context_menu.addAction("⭐ Set as Keyword")
+                keyword_action.triggered.connect(lambda: self.on_keyword_toggled(tag))
+                context_menu.addSeparator()
+        
         # Check what's selected to determine available actions
         selected_rows = self.app.gallery_tab.table.selectionModel().selectedRows()
         selected_images = self.get_selected_images()
@@ -499,14 +505,10 @@ class EventHandlers:
         
         # Handle image deletion
         filename = data
-        img_data = next((img for img in self.app.data_manager.images_data if img['filename'] == filename), None)
-        if not img_data:
-            return
-        
-        # Find the index in the original data
-        index = next((i for i, img in enumerate(self.app.data_manager.images_data) if img['filename'] == filename), -1)
+        index = self.app.data_manager.find_image_index(filename)
         if index < 0:
             return
+        img_data = self.app.data_manager.images_data[index]
         
         # Create appropriate confirmation message
         if from_disk:
@@ -600,6 +602,11 @@ class EventHandlers:
         """Refresh the gallery by reloading images from the current folder"""
         if not self.app.data_manager.current_folder:
             return
+        
+        if self._active_worker is not None:
+            # Files are still changing; the operation refreshes the gallery when it finishes
+            self.app.set_status("Please wait for the current image operation to finish")
+            return
             
         # Remember current selection
         current_filename = None
@@ -645,6 +652,37 @@ class EventHandlers:
     
     # Utility methods
     
+    def _start_image_operation(self, operation, on_finished, **kwargs):
+        """Run an ImageProcessor operation on the thread pool, reporting progress in the Utils tab"""
+        if self._active_worker is not None:
+            self.app.set_status("Another image operation is still running")
+            return False
+        
+        utils_tab = self.app.utils_tab
+        worker = ImageOpWorker(operation, **kwargs)
+        worker.signals.progress.connect(utils_tab.set_operation_progress, Qt.ConnectionType.QueuedConnection)
+        worker.signals.status.connect(self.app.set_status, Qt.ConnectionType.QueuedConnection)
+        # Connected first so the buttons are back before the result handler runs
+        worker.signals.finished.connect(self._on_image_operation_done, Qt.ConnectionType.QueuedConnection)
+        worker.signals.finished.connect(on_finished, Qt.ConnectionType.QueuedConnection)
+        
+        # Keep a reference so the worker's signals outlive the pool thread
+        self._active_worker = worker
+        utils_tab.set_operation_running(True)
+        QThreadPool.globalInstance().start(worker)
+        return True
+    
+    def _on_image_operation_done(self, result):
+        """Unlock the Utils tab once a background operation finishes"""
+        self._active_worker = None
+        self.app.utils_tab.set_operation_running(False)
+    
+    def cancel_image_operation(self):
+        """Ask the running background operation to stop after the current image"""
+        if self._active_worker is not None:
+            self._active_worker.cancel()
+            self.app.set_status("Cancelling...")
+    
     def fix_images(self):
         """Process images with user-selected options"""
         # Pass current folder as default
@@ -655,7 +693,7 @@ class EventHandlers:
         options = dialog.result
         
         # Process images based on scope selection
-        if self.app.utils_tab.fix_selected_radio.isChecked():
+        if self.app.utils_tab.fix_scope.is_selected():
             selected_images = self.get_selected_images()
             if not selected_images:
                 QMessageBox.information(self.app, "No Selection", "No images are selected. Please select images first or choose 'Fix All Images'.")
@@ -664,23 +702,28 @@ class EventHandlers:
         else:
             images_to_process = None
         
-        # Process images
-        result = self.app.image_processor.fix_images(
+        # Process images in the background; the result is reported when the worker finishes
+        self._start_image_operation(
+            self._background_processor.fix_images,
+            lambda result: self._on_fix_images_finished(result, options),
             source_folder=options['source_folder'],
             target_size=options['size'],
             keep_aspect=options['keep_aspect'],
             output_folder=options['output_folder'],
             resize_small_images=options.get('resize_small_images', False),
-            images_to_process=images_to_process,
-            status_callback=self.app.set_status
+            images_to_process=images_to_process
         )
-        
+    
+    def _on_fix_images_finished(self, result, options):
+        """Report the outcome of a background fix_images run"""
         if 'error' in result:
             QMessageBox.information(self.app, "No Images", result['error'])
             return
         
         # Show completion message
         message = f"Processed {result['processed']} images.\n"
+        if result.get('cancelled'):
+            message = "Processing was cancelled.\n" + message
         message += f"Skipped {result['skipped']} images (already correct size).\n"
         if result['invalid']:
             message += f"Failed to process {len(result['invalid'])} images:\n"
@@ -709,7 +752,7 @@ class EventHandlers:
         options = dialog.result
         
         # Determine which images to process based on radio button selection
-        if self.app.utils_tab.dup_selected_radio.isChecked():
+        if self.app.utils_tab.dup_scope.is_selected():
             # Process only selected images
             selected_images = self.get_selected_images()
             if not selected_images:
@@ -721,15 +764,18 @@ class EventHandlers:
             # Process all images - let the processor handle it
             images_to_process = None
         
-        # Process duplicates
-        result = self.app.image_processor.create_duplicates(
+        # Create the duplicates in the background; the result is reported when the worker finishes
+        self._start_image_operation(
+            self._background_processor.create_duplicates,
+            lambda result: self._on_create_duplicates_finished(result, options),
             input_folder=options['input_folder'],
             output_folder=options['output_folder'],
             transformations=options,
-            images_to_process=images_to_process,
-            status_callback=self.app.set_status
+            images_to_process=images_to_process
         )
-        
+    
+    def _on_create_duplicates_finished(self, result, options):
+        """Report the outcome of a background create_duplicates run"""
         if 'error' in result:
             QMessageBox.information(self.app, "No Images", result['error'])
             return
@@ -739,6 +785,8 @@ class EventHandlers:
             message = f"Created {result['created_files']} duplicate images in the same folder.\n"
         else:
             message = f"Created {result['created_files']} files (originals + duplicates).\n"
+        if result.get('cancelled'):
+            message = "Duplication was cancelled.\n" + message
         
         # Check if this was simple duplication or transformations
         if not any([options['flip_horizontal'], options['rotate_90_left'], options['rotate_90_right'], options['rotate_180']]):
@@ -781,7 +829,7 @@ class EventHandlers:
         scramble_order = self.app.utils_tab.scramble_order_checkbox.isChecked()
         
         # Determine which images to process based on radio button selection
-        if self.app.utils_tab.rename_selected_radio.isChecked():
+        if self.app.utils_tab.rename_scope.is_selected():
             # Process only selected images
             selected_images = self.get_selected_images()
             if not selected_images:
@@ -814,14 +862,21 @@ class EventHandlers:
         if reply != QMessageBox.StandardButton.Yes:
             return
         
-        # Perform the rename operation
-        result = self.app.image_processor.mass_rename_images(
+        # Rename in the background; the gallery is locked until the new names are loaded
+        started = self._start_image_operation(
+            self._background_processor.mass_rename_images,
+            lambda result: self._on_mass_rename_finished(result, prefix),
             folder_path=self.app.data_manager.current_folder,
             prefix=prefix,
-            images_to_process=images_to_process,
-            scramble_order=scramble_order,
-            status_callback=self.app.set_status
+            images_to_process=list(images_to_process),
+            scramble_order=scramble_order
         )
+        if started:
+            self.app.gallery_tab.setEnabled(False)
+    
+    def _on_mass_rename_finished(self, result, prefix):
+        """Report the outcome of a background mass rename and reload the gallery"""
+        self.app.gallery_tab.setEnabled(True)
         
         if 'error' in result:
             QMessageBox.critical(self.app, "Rename Error", result['error'])
@@ -829,6 +884,8 @@ class EventHandlers:
         
         # Show completion message
         message = f"Successfully renamed {result['renamed_images']} images and {result['renamed_descriptions']} description files.\n"
+        if result.get('cancelled'):
+            message = "Renaming was cancelled; the remaining images keep their old names.\n" + message
         
         if result.get('scrambled', False):
             message += "Applied order scrambling with random letters.\n"
@@ -883,17 +940,17 @@ class EventHandlers:
         """Test tag scrambling with user input"""
         test_input = self.app.utils_tab.test_tags_entry.text().strip()
         if not test_input:
-            self.app.utils_tab.test_scramble_result.setText("Please enter some test tags separated by commas.")
+            self.app.utils_tab.show_test_scramble_result("Please enter some test tags separated by commas.")
             return
         
         # Parse tags from input
         tags = [tag.strip() for tag in test_input.split(',') if tag.strip()]
         if len(tags) < 2:
-            self.app.utils_tab.test_scramble_result.setText("Please enter at least 2 tags to see scrambling effect.")
+            self.app.utils_tab.show_test_scramble_result("Please enter at least 2 tags to see scrambling effect.")
             return
         
         # Get scrambling method
-        preserve_first = self.app.utils_tab.preserve_first_tag.isChecked()
+        preserve_first = self.app.utils_tab.scramble_method_combo.currentIndex() == 0
         
         # Generate multiple scrambled versions for demonstration
         original = ", ".join(tags)
@@ -908,7 +965,7 @@ class EventHandlers:
         for i, version in enumerate(scrambled_versions, 1):
             result_text += f"{i}. {version}\n"
         
-        self.app.utils_tab.test_scramble_result.setText(result_text)
+        self.app.utils_tab.show_test_scramble_result(result_text)
     
     def preview_tag_scramble(self):
         """Preview tag scrambling changes without applying them"""
@@ -917,7 +974,7 @@ class EventHandlers:
             return
         
         # Determine which images to process
-        if self.app.utils_tab.scramble_selected_radio.isChecked():
+        if self.app.utils_tab.scramble_scope.is_selected():
             selected_images = self.get_selected_images()
             if not selected_images:
                 QMessageBox.information(self.app, "No Selection", "No images are selected. Please select images first or choose 'Scramble All Descriptions'.")
@@ -942,7 +999,7 @@ class EventHandlers:
             return
         
         # Get scrambling method
-        preserve_first = self.app.utils_tab.preserve_first_tag.isChecked()
+        preserve_first = self.app.utils_tab.scramble_method_combo.currentIndex() == 0
         
         # Create preview dialog
         preview_dialog = QDialog(self.app)
@@ -1016,7 +1073,7 @@ class EventHandlers:
             return
         
         # Determine which images to process
-        if self.app.utils_tab.scramble_selected_radio.isChecked():
+        if self.app.utils_tab.scramble_scope.is_selected():
             selected_images = self.get_selected_images()
             if not selected_images:
                 QMessageBox.information(self.app, "No Selection", "No images are selected. Please select images first or choose 'Scramble All Descriptions'.")
@@ -1041,7 +1098,7 @@ class EventHandlers:
             return
         
         # Get scrambling method
-        preserve_first = self.app.utils_tab.preserve_first_tag.isChecked()
+        preserve_first = self.app.utils_tab.scramble_method_combo.currentIndex() == 0
         method_text = "preserving first tag" if preserve_first else "fully randomizing"
         
         # Confirm with user
@@ -1117,9 +1174,9 @@ class EventHandlers:
             List of scrambled tags
         """
         if len(tags) <= 1:
-            return tags.copy()
+            return list(tags)
         
-        tags_copy = tags.copy()
+        tags_copy = list(tags)
         keyword_tag = self.app.tag_manager.get_keyword_tag() if self.app.tag_manager else None
         
         if preserve_first:
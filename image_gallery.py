@@ -16,7 +16,8 @@ import sys
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QStatusBar, QTabWidget
 )
-from PyQt6.QtGui import QAction, QFont
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QAction, QFont, QPixmapCache
 
 # Import our custom modules
 from ui_components import GalleryTab, UtilsTab
@@ -138,11 +139,19 @@ class ImageGalleryApp(QMainWindow):
     def set_status(self, message):
         """Set status bar message"""
         self.status_bar.showMessage(message)
+    
+    def closeEvent(self, event):
+        """Stop any background image operation before the window closes"""
+        self.event_handlers.cancel_image_operation()
+        QThreadPool.globalInstance().waitForDone()
+        super().closeEvent(event)
 
 
 def main():
     """Main application entry point"""
     app = QApplication(sys.argv)
+    # Room (in KB) for the tag chip bitmaps shared by the tag panels and the table
+    QPixmapCache.setCacheLimit(20480)
     window = ImageGalleryApp()
     window.show()
     
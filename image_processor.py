@@ -10,7 +10,70 @@ import random
 import string
 from PIL import Image
 from PyQt6.QtWidgets import QApplication, QProgressDialog, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, pyqtSignal
+
+from data_manager import IMAGE_EXTENSIONS
+
+
+# Filename suffix appended to augmented copies, keyed by transformation
+TRANSFORM_SUFFIXES = {
+    'flip': "_flipHor",
+    'rot90l': "_rotLeft",
+    'rot90r': "_rotRight",
+    'rot180': "_flipVert",
+    'duplicate': "_dup",
+}
+
+# Encoder options shared by every saved image. optimize and progressive are
+# left at PIL's defaults (off); subsampling spells out the 4:2:0 libjpeg would
+# pick anyway. Non-JPEG encoders ignore the JPEG-specific keys.
+IMAGE_SAVE_OPTIONS = {
+    'quality': 95,
+    'subsampling': 2,  # 4:2:0
+}
+
+
+class ImageOpSignals(QObject):
+    """Signals an ImageOpWorker uses to report back to the GUI thread"""
+    progress = pyqtSignal(int, int)  # done, total
+    status = pyqtSignal(str)
+    finished = pyqtSignal(object)  # the operation's result dict
+
+
+class ImageOpWorker(QRunnable):
+    """Runs one ImageProcessor operation on a QThreadPool thread
+    
+    The operation is called with the given keyword arguments plus status,
+    progress and cancel hooks wired to this worker, so it must not touch any
+    widgets itself (use an ImageProcessor without a parent).
+    """
+    
+    def __init__(self, operation, **kwargs):
+        super().__init__()
+        self.operation = operation
+        self.kwargs = kwargs
+        self.signals = ImageOpSignals()
+        self._cancelled = False
+    
+    def cancel(self):
+        """Ask the operation to stop before its next image"""
+        self._cancelled = True
+    
+    def is_cancelled(self):
+        return self._cancelled
+    
+    def run(self):
+        try:
+            result = self.operation(status_callback=self.signals.status.emit,
+                                    progress_callback=self.signals.progress.emit,
+                                    cancel_check=self.is_cancelled,
+                                    **self.kwargs)
+        except Exception as e:
+            print(f"Error in background image operation: {e}")
+            result = {'error': str(e)}
+        if self._cancelled and 'error' not in result:
+            result['cancelled'] = True
+        self.signals.finished.emit(result)
 
 
 class ImageProcessor:
@@ -22,37 +85,39 @@ class ImageProcessor:
     @staticmethod
     def get_image_files(folder_path):
         """Get all supported image files from a folder"""
-        image_extensions = ('.jpg', '.jpeg', '.png', '.webp')
-        return [f for f in os.listdir(folder_path) 
-                if os.path.isfile(os.path.join(folder_path, f)) 
-                and f.lower().endswith(image_extensions)]
+        image_files = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                # Single hash lookup on the extension instead of several suffix compares
+                name = entry.name
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                    image_files.append(name)
+        return image_files
     
     @staticmethod
     def validate_image(img_path, allow_small_images=False):
         """Validate that an image is not corrupt and optionally check size requirements"""
         try:
-            with Image.open(img_path) as img:
-                # Check if image can be loaded and verify
-                img.verify()
-                
-            # Need to reopen after verify()
+            # Read the size from the header before verify(), which leaves the image
+            # unusable, so one open covers both checks without decoding any pixels
             with Image.open(img_path) as img:
                 width, height = img.size
-                
-                # Check minimum size requirement (512x512) only if not allowing small images
-                if not allow_small_images and (width < 512 or height < 512):
-                    return False, f"Image too small: {width}x{height} (minimum 512x512)"
-                
-                # Check for extremely small images that can't be reasonably upscaled
-                if width < 32 or height < 32:
-                    return False, f"Image too small to process: {width}x{height} (minimum 32x32)"
-                
-            return True, "Valid"
-            
+                img.verify()
         except Exception as e:
             return False, f"Invalid or corrupt image: {str(e)}"
+        
+        # Check minimum size requirement (512x512) only if not allowing small images
+        if not allow_small_images and (width < 512 or height < 512):
+            return False, f"Image too small: {width}x{height} (minimum 512x512)"
+        
+        # Check for extremely small images that can't be reasonably upscaled
+        if width < 32 or height < 32:
+            return False, f"Image too small to process: {width}x{height} (minimum 32x32)"
+        
+        return True, "Valid"
     
-    def fix_images(self, source_folder, target_size, keep_aspect, output_folder, resize_small_images=False, images_to_process=None, status_callback=None):
+    def fix_images(self, source_folder, target_size, keep_aspect, output_folder, resize_small_images=False, images_to_process=None, status_callback=None,
+                   progress_callback=None, cancel_check=None):
         """
         Process images to fix dimensions and format
         
@@ -64,6 +129,8 @@ class ImageProcessor:
             resize_small_images: Whether to upscale small images instead of skipping them
             images_to_process: List of image filenames to process (if None, processes all)
             status_callback: Function to call with status updates
+            progress_callback: Function called with (done, total) before each image
+            cancel_check: Function returning True when processing should stop
         
         Returns:
             dict: Results summary
@@ -78,6 +145,9 @@ class ImageProcessor:
         if not image_files:
             return {'error': "No images found in the specified scope"}
         
+        # In-place processing never needs files copied alongside the images
+        same_folder = source_folder == output_folder
+        
         # Create output directory if it doesn't exist
         if not os.path.exists(output_folder):
             try:
@@ -102,6 +172,11 @@ class ImageProcessor:
         
         # Process each image
         for i, img_file in enumerate(image_files):
+            if cancel_check and cancel_check():
+                break
+            if progress_callback:
+                progress_callback(i, len(image_files))
+            
             # Update progress
             if progress:
                 progress.setValue(i)
@@ -110,6 +185,16 @@ class ImageProcessor:
                     
             img_path = os.path.join(source_folder, img_file)
             
+            # Same folder and already the target geometry: nothing to write or
+            # copy, so skip it from the header alone without decoding pixels
+            if same_folder and self._has_target_size(img_path, target_size, keep_aspect):
+                skipped_images += 1
+                if status_callback:
+                    status_callback(f"Processing images: {processed_images + skipped_images}/{len(image_files)}")
+                if progress:
+                    QApplication.processEvents()
+                continue
+            
             # Validate image first
             is_valid, validation_message = self.validate_image(img_path, allow_small_images=resize_small_images)
             if not is_valid:
@@ -144,7 +229,7 @@ class ImageProcessor:
                 
                 if is_correct_size and not needs_upscaling:
                     # Already good, just copy if different folders
-                    if source_folder != output_folder:
+                    if not same_folder:
                         fixed_img_path = os.path.join(output_folder, img_file)
                         shutil.copy2(img_path, fixed_img_path)
                     skipped_images += 1
@@ -162,11 +247,12 @@ class ImageProcessor:
                     
                     # Save the processed image
                     fixed_img_path = os.path.join(output_folder, img_file)
-                    processed_img.save(fixed_img_path, quality=95)
+                    processed_img.save(fixed_img_path, **IMAGE_SAVE_OPTIONS)
                     processed_images += 1
                 
                 # Copy associated text file if it exists
-                self._copy_text_file(source_folder, output_folder, img_file)
+                if not same_folder:
+                    self._copy_text_file(source_folder, output_folder, img_file)
                 
                 # Update status
                 if status_callback:
@@ -179,7 +265,7 @@ class ImageProcessor:
                 invalid_images.append((img_file, str(e)))
         
         # Copy JSON files
-        if source_folder != output_folder:
+        if not same_folder:
             self._copy_json_files(source_folder, output_folder)
         
         # Close progress dialog properly
@@ -194,7 +280,8 @@ class ImageProcessor:
             'total': len(image_files)
         }
     
-    def create_duplicates(self, input_folder, output_folder, transformations, images_to_process=None, status_callback=None):
+    def create_duplicates(self, input_folder, output_folder, transformations, images_to_process=None, status_callback=None,
+                          progress_callback=None, cancel_check=None):
         """Create duplicated images with transformations"""
         
         if images_to_process is None:
@@ -241,36 +328,53 @@ class ImageProcessor:
         error_files = []
         
         # Process each image
+        cancelled = False
         for i, img_file in enumerate(image_files):
+            if cancel_check and cancel_check():
+                cancelled = True
+                break
+            if progress_callback:
+                progress_callback(i, len(image_files))
+            
             if progress:
                 if progress.wasCanceled():
+                    cancelled = True
                     break
                 progress.setValue(i)
                 progress.setLabelText(f"Processing {img_file}...")
                 QApplication.processEvents()
             
             img_path = os.path.join(input_folder, img_file)
-            base_name = os.path.splitext(img_file)[0]
-            img_ext = os.path.splitext(img_file)[1]
+            base_name, img_ext = os.path.splitext(img_file)
             
             try:
-                original_img = Image.open(img_path)
-                
-                # Only copy original if different folders
+                # Only copy original if different folders; the source bytes are
+                # copied as-is rather than decoded and re-encoded
                 if input_folder != output_folder:
                     original_output_path = os.path.join(output_folder, img_file)
-                    original_img.save(original_output_path, quality=95)
+                    shutil.copy2(img_path, original_output_path)
                     created_files += 1
                     self._copy_text_file(input_folder, output_folder, img_file)
                 
+                # Decoded lazily and at most once; every transform reuses these pixels
+                original_img = None
+                
                 # Create transformed versions
                 for transform_key, transform_name in transform_ops:
                     try:
-                        transformed_img, suffix = self._apply_transformation(original_img, transform_key)
+                        suffix = TRANSFORM_SUFFIXES[transform_key]
                         new_img_name = f"{base_name}{suffix}{img_ext}"
                         new_img_path = os.path.join(output_folder, new_img_name)
                         
-                        transformed_img.save(new_img_path, quality=95)
+                        if transform_key == 'duplicate':
+                            # Simple duplicate - no pixel work needed
+                            shutil.copy2(img_path, new_img_path)
+                        else:
+                            if original_img is None:
+                                original_img = Image.open(img_path)
+                                original_img.load()
+                            transformed_img, _ = self._apply_transformation(original_img, transform_key)
+                            transformed_img.save(new_img_path, **IMAGE_SAVE_OPTIONS)
                         created_files += 1
                         
                         self._copy_transformed_text_file(input_folder, output_folder, img_file, suffix)
@@ -279,14 +383,18 @@ class ImageProcessor:
                         error_msg = f"Error creating {transform_name} of {img_file}: {str(e)}"
                         error_files.append(error_msg)
                         print(f"Error: {error_msg}")
+                
+                if original_img is not None:
+                    original_img.close()
                     
             except Exception as e:
                 error_msg = f"Error processing {img_file}: {str(e)}"
                 error_files.append(error_msg)
                 print(f"Error: {error_msg}")
         
-        # Update JSON file with all variants
-        self._create_augmented_json(input_folder, output_folder, transform_ops)
+        # Update JSON file with all variants (skipped on cancel, when not every variant was written)
+        if not cancelled:
+            self._create_augmented_json(input_folder, output_folder, transform_ops)
         
         # Close progress dialog properly
         if progress:
@@ -301,7 +409,8 @@ class ImageProcessor:
             'same_folder': input_folder == output_folder
         }
     
-    def mass_rename_images(self, folder_path, prefix, images_to_process=None, scramble_order=False, status_callback=None):
+    def mass_rename_images(self, folder_path, prefix, images_to_process=None, scramble_order=False, status_callback=None,
+                           progress_callback=None, cancel_check=None):
         """
         Rename images in a folder with a new prefix and sequential numbers
         
@@ -311,6 +420,8 @@ class ImageProcessor:
             images_to_process: List of image data dicts to process (if None, processes all)
             scramble_order: If True, adds random alpha characters to scramble order
             status_callback: Function to call with status updates
+            progress_callback: Function called with (done, total) before each image
+            cancel_check: Function returning True when renaming should stop
         
         Returns:
             dict: Results summary
@@ -359,6 +470,11 @@ class ImageProcessor:
         
         # Rename files
         for i, old_filename in enumerate(image_files):
+            if cancel_check and cancel_check():
+                break
+            if progress_callback:
+                progress_callback(i, len(image_files))
+            
             if progress:
                 if progress.wasCanceled():
                     break
@@ -421,6 +537,24 @@ class ImageProcessor:
             'scrambled': scramble_order
         }
     
+    @staticmethod
+    def _has_target_size(img_path, target_size, keep_aspect):
+        """Check from the image header alone whether fix_images would leave it unchanged"""
+        try:
+            # Image.open only parses the header; pixels are never decoded here
+            with Image.open(img_path) as img:
+                width, height = img.size
+        except Exception:
+            return False
+        
+        # Images below the 512px minimum still go through validation/upscaling
+        if min(width, height) < 512:
+            return False
+        
+        if keep_aspect:
+            return max(width, height) == target_size
+        return width == height == target_size
+    
     def _generate_scramble_characters(self, count):
         """
         Generate random alphabetic characters for scrambling
@@ -431,22 +565,15 @@ class ImageProcessor:
         Returns:
             List of single characters with no duplicates
         """
-        # Start with all lowercase letters
-        available_chars = list(string.ascii_lowercase)
-        random.shuffle(available_chars)
-        
+        letters = string.ascii_lowercase
         scramble_chars = []
-        char_index = 0
         
-        for i in range(count):
-            # If we've used all letters, reshuffle and start over
-            if char_index >= len(available_chars):
-                random.shuffle(available_chars)
-                char_index = 0
-            
-            scramble_chars.append(available_chars[char_index])
-            char_index += 1
+        # Each pass adds one freshly shuffled alphabet, so every letter is
+        # used once before any repeats
+        while len(scramble_chars) < count:
+            scramble_chars.extend(random.sample(letters, len(letters)))
         
+        del scramble_chars[count:]
         return scramble_chars
     
     def _upscale_small_image(self, img, target_size):
@@ -510,24 +637,19 @@ class ImageProcessor:
         """Apply a specific transformation to an image"""
         if transform_key == 'flip':
             transformed_img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-            suffix = "_flipHor"
         elif transform_key == 'rot90l':
             transformed_img = img.transpose(Image.Transpose.ROTATE_90)
-            suffix = "_rotLeft"
         elif transform_key == 'rot90r':
             transformed_img = img.transpose(Image.Transpose.ROTATE_270)
-            suffix = "_rotRight"
         elif transform_key == 'rot180':
             transformed_img = img.transpose(Image.Transpose.ROTATE_180)
-            suffix = "_flipVert"
         elif transform_key == 'duplicate':
             # Simple duplicate - no transformation, just copy
             transformed_img = img.copy()
-            suffix = "_dup"
         else:
             raise ValueError(f"Unknown transformation: {transform_key}")
         
-        return transformed_img, suffix
+        return transformed_img, TRANSFORM_SUFFIXES[transform_key]
     
     def _copy_text_file(self, source_folder, output_folder, img_file):
         """Copy associated text file if it exists"""
@@ -562,66 +684,59 @@ class ImageProcessor:
                 print(f"Error copying JSON file: {str(e)}")
     
     def _create_augmented_json(self, input_folder, output_folder, transform_list):
-        """Create updated JSON file with all image variants"""
-        json_files = [f for f in os.listdir(input_folder) if f.endswith('.json')]
+        """Create updated JSON files listing every image variant, one per description JSON"""
+        # tags.json holds the tag manager's state, not descriptions; never rewrite it here
+        json_files = sorted(f for f in os.listdir(input_folder) if f.endswith('.json') and f != 'tags.json')
         if not json_files:
             return
         
-        try:
-            # Load original JSON
-            json_path = os.path.join(input_folder, json_files[0])
-            with open(json_path, 'r', encoding='utf-8') as f:
-                original_json = json.load(f)
-            
-            # Create new JSON with all variants
-            new_json_data = []
-            
-            for item in original_json:
-                if 'fileName' in item and 'description' in item:
-                    original_filename = item['fileName']
-                    base_name = os.path.splitext(original_filename)[0]
-                    img_ext = os.path.splitext(original_filename)[1]
-                    description = item['description']
-                    
-                    # Always add original (it exists in both cases)
-                    new_json_data.append({
-                        'fileName': original_filename,
-                        'description': description
-                    })
-                    
-                    # Add transformed versions
-                    for transform_key, transform_name in transform_list:
-                        if transform_key == 'flip':
-                            suffix = "_flipHor"
-                        elif transform_key == 'rot90l':
-                            suffix = "_rotLeft"
-                        elif transform_key == 'rot90r':
-                            suffix = "_rotRight"
-                        elif transform_key == 'rot180':
-                            suffix = "_flipVert"
-                        elif transform_key == 'duplicate':
-                            suffix = "_dup"
+        # Resolve suffixes once rather than per JSON entry
+        suffixes = [TRANSFORM_SUFFIXES[transform_key] for transform_key, _ in transform_list]
+        
+        for json_file in json_files:
+            try:
+                # Load original JSON
+                json_path = os.path.join(input_folder, json_file)
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    original_json = json.load(f)
+                if not isinstance(original_json, list):
+                    continue
+                
+                # Create new JSON with all variants
+                new_json_data = []
+                append_entry = new_json_data.append
+                
+                for item in original_json:
+                    if isinstance(item, dict) and 'fileName' in item and 'description' in item:
+                        original_filename = item['fileName']
+                        base_name, img_ext = os.path.splitext(original_filename)
+                        description = item['description']
                         
-                        new_filename = f"{base_name}{suffix}{img_ext}"
-                        new_json_data.append({
-                            'fileName': new_filename,
-                            'description': description
-                        })
-            
-            # Save updated JSON
-            if input_folder == output_folder:
-                # Same folder - update the original JSON file
-                new_json_path = json_path
-            else:
-                # Different folder - create new augmented JSON
-                base_json_name = os.path.splitext(json_files[0])[0]
-                new_json_path = os.path.join(output_folder, f"{base_json_name}_augmented.json")
+                        # Always add original (it exists in both cases)
+                        append_entry({'fileName': original_filename, 'description': description})
+                        
+                        # Add transformed versions
+                        for suffix in suffixes:
+                            append_entry({'fileName': f"{base_name}{suffix}{img_ext}", 'description': description})
                 
-            with open(new_json_path, 'w', encoding='utf-8') as f:
-                json.dump(new_json_data, f, indent=2, ensure_ascii=False)
+                # Not a description file; leave it untouched
+                if not new_json_data:
+                    continue
                 
-        except Exception as e:
-            print(f"Error processing JSON file: {str(e)}")
+                # Save updated JSON
+                if input_folder == output_folder:
+                    # Same folder - update the original JSON file
+                    new_json_path = json_path
+                else:
+                    # Different folder - create new augmented JSON
+                    base_json_name = os.path.splitext(json_file)[0]
+                    new_json_path = os.path.join(output_folder, f"{base_json_name}_augmented.json")
+                    
+                with open(new_json_path, 'w', encoding='utf-8') as f:
+                    json.dump(new_json_data, f, indent=2, ensure_ascii=False)
+                    
+            except Exception as e:
+                print(f"Error processing JSON file {json_file}: {str(e)}")
     
     def _check_rename_conflicts(self, folder_path, prefix, image_files, num_digits, scramble_chars=None):
         """Check if the new filenames would conflict with existing files"""
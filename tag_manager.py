@@ -6,23 +6,88 @@ Handles tag creation, storage, and application to images with keyword support
 
 import json
 import os
-import re
-from typing import List, Dict, Set, Optional
+import sys
+from hashlib import blake2b
+from typing import List, Dict, Set, Optional, Iterator, Sequence, Iterable
+
+try:
+    import orjson  # Optional: faster tags.json encode/decode
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streaming load of very large tags.json files
+except ImportError:
+    ijson = None
+
+
+# Maps ';' onto ',' so tag text can be split with a plain str.split
+_TAG_DELIMITER_TRANS = str.maketrans({';': ','})
+
+# tags.json files larger than this are stream-parsed when ijson is available
+_STREAM_LOAD_THRESHOLD = 10 << 20
+
+# Append-only log of changes made since tags.json was last written in full
+_JOURNAL_FILENAME = 'tags.journal.jsonl'
+
+
+def _clean_tags(tags) -> List[str]:
+    """Strip tags, drop empty ones, and intern the rest so every image shares one str per tag"""
+    intern = sys.intern
+    return [intern(tag) for tag in (tag.strip() for tag in tags) if tag]
+
+
+def _dump_json_bytes(data, pretty: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _load_json_bytes(raw: bytes):
+    """Parse UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class TagManager:
     """Manages tag definitions and their application to images"""
     
+    # Fixed attribute layout: no per-instance __dict__, slot access in hot paths
+    __slots__ = (
+        'available_tags', 'tag_categories', 'image_tags', 'keyword_tag', 'project_folder',
+        '_tag_to_images', '_total_assignments', '_stats_dirty',
+        '_cached_stats', '_last_saved_hash', '_dirty_images', '_meta_dirty',
+    )
+    
     def __init__(self):
         self.available_tags: Set[str] = set()
-        self.tag_categories: Dict[str, List[str]] = {}
+        self.tag_categories: Dict[str, Set[str]] = {}
         self.image_tags: Dict[str, List[str]] = {}  # filename -> tags
         self.keyword_tag: Optional[str] = None  # The single keyword tag
         self.project_folder: Optional[str] = None
+        self._tag_to_images: Dict[str, Set[str]] = {}  # tag -> filenames (inverted index of image_tags)
+        self._total_assignments: int = 0  # sum of len(tags) over image_tags, kept incrementally
+        self._stats_dirty: bool = True  # set by every mutator; get_statistics recomputes when True
+        self._cached_stats: Optional[Dict[str, int]] = None
+        self._last_saved_hash: Optional[bytes] = None  # digest of the tags.json bytes last written or read
+        self._dirty_images: Set[str] = set()  # images changed since the last save or journal append
+        self._meta_dirty: bool = False  # available tags, categories or keyword changed since then
         
+    def _mark_changed(self, filenames: Iterable[str] = (), meta: bool = False):
+        """Invalidate cached statistics and record what the next save has to write"""
+        self._stats_dirty = True
+        self._dirty_images.update(filenames)
+        if meta:
+            self._meta_dirty = True
+    
     def set_project_folder(self, folder_path: str):
         """Set the current project folder and load tags if they exist"""
         self.project_folder = folder_path
+        self._last_saved_hash = None
         self.load_tags_from_project()
     
     def add_tag(self, tag: str, category: str = "general"):
@@ -31,12 +96,14 @@ class TagManager:
             return
         
         tag = tag.strip()
-        self.available_tags.add(tag)
+        category_tags = self.tag_categories.setdefault(category, set())
+        if tag in self.available_tags and tag in category_tags:
+            # Already known; leave the meta record out of the next journal append
+            return
         
-        if category not in self.tag_categories:
-            self.tag_categories[category] = []
-        if tag not in self.tag_categories[category]:
-            self.tag_categories[category].append(tag)
+        self.available_tags.add(tag)
+        category_tags.add(tag)
+        self._mark_changed(meta=True)
     
     def add_tags_from_list(self, tags: List[str]):
         """Add multiple tags from a list"""
@@ -48,26 +115,36 @@ class TagManager:
         """Remove a tag from the system"""
         self.available_tags.discard(tag)
         for category in self.tag_categories.values():
-            if tag in category:
-                category.remove(tag)
+            category.discard(tag)
         
-        # Remove from all images
-        for filename in self.image_tags:
-            if tag in self.image_tags[filename]:
-                self.image_tags[filename].remove(tag)
+        # Remove from the images that carry it (found via the index, not a full scan)
+        affected = self._tag_to_images.pop(tag, ())
+        for filename in affected:
+            tags = self.image_tags.get(filename)
+            if tags:
+                # Edit the list in place; tags are normally unique per image
+                occurrences = tags.count(tag)
+                if occurrences == 1:
+                    tags.remove(tag)
+                else:
+                    tags[:] = [t for t in tags if t != tag]
+                self._total_assignments -= occurrences
         
         # Clear keyword if this tag was the keyword
         if self.keyword_tag == tag:
             self.keyword_tag = None
+        self._mark_changed(affected, meta=True)
     
     def set_keyword_tag(self, tag: str):
         """Set a tag as the keyword tag (only one can be keyword)"""
         if tag in self.available_tags:
             self.keyword_tag = tag
+            self._mark_changed(meta=True)
     
     def clear_keyword_tag(self):
         """Clear the current keyword tag"""
         self.keyword_tag = None
+        self._mark_changed(meta=True)
     
     def is_keyword_tag(self, tag: str) -> bool:
         """Check if a tag is the keyword tag"""
@@ -83,42 +160,101 @@ class TagManager:
             self.keyword_tag = None
         else:
             self.keyword_tag = tag
+        self._mark_changed(meta=True)
+    
+    def get_tags_for_image(self, filename: str) -> Sequence[str]:
+        """Get all tags applied to an image, with keyword first if present (read-only tuple)"""
+        return tuple(self._sort_tags_with_keyword_first(self.image_tags.get(filename, ())))
     
-    def get_tags_for_image(self, filename: str) -> List[str]:
-        """Get all tags applied to an image, with keyword first if present"""
-        tags = self.image_tags.get(filename, []).copy()
-        return self._sort_tags_with_keyword_first(tags)
+    def get_tags_for_image_copy(self, filename: str) -> List[str]:
+        """Get a mutable list of an image's tags, with keyword first if present"""
+        return list(self.iter_tags_for_image(filename))
+    
+    def iter_tags_for_image(self, filename: str) -> Iterator[str]:
+        """Iterate over an image's tags, keyword first, without building a list"""
+        return self._iter_keyword_first(self.image_tags.get(filename, ()))
+    
+    def _iter_keyword_first(self, tags) -> Iterator[str]:
+        """Yield tags with the keyword tag first, others in original order"""
+        keyword_tag = self.keyword_tag
+        if keyword_tag and keyword_tag in tags:
+            yield keyword_tag
+            for tag in tags:
+                if tag != keyword_tag:
+                    yield tag
+        else:
+            yield from tags
     
     def _sort_tags_with_keyword_first(self, tags: List[str]) -> List[str]:
         """Sort tags with keyword tag first, others in original order"""
-        if not self.keyword_tag or self.keyword_tag not in tags:
+        keyword_tag = self.keyword_tag
+        # Common cases need no new list: no keyword, keyword already first, or absent
+        if not keyword_tag or not tags or tags[0] == keyword_tag or keyword_tag not in tags:
             return tags
         
         # Put keyword first, keep others in order
-        result = [self.keyword_tag]
-        result.extend([tag for tag in tags if tag != self.keyword_tag])
+        result = [keyword_tag]
+        result.extend([tag for tag in tags if tag != keyword_tag])
         return result
     
     def apply_tags_to_image(self, filename: str, tags: List[str]):
         """Apply tags to an image (replaces existing tags)"""
-        clean_tags = [tag.strip() for tag in tags if tag.strip()]
-        # Store tags in original order - sorting happens in get_tags_for_image
-        self.image_tags[filename] = clean_tags
+        clean_tags = _clean_tags(tags)
+        self._apply_clean_tags_to_image(filename, clean_tags, replace=True)
         
         # Add tags to available tags if they don't exist
         for tag in clean_tags:
             self.add_tag(tag)
     
     def add_tags_to_image(self, filename: str, tags: List[str]):
-        """Add tags to an image (keeps existing tags)"""
-        existing_tags = self.image_tags.get(filename, [])
-        all_tags = list(set(existing_tags + [tag.strip() for tag in tags if tag.strip()]))
-        self.apply_tags_to_image(filename, all_tags)
+        """Add tags to an image (keeps existing tags and their order)"""
+        clean_tags = _clean_tags(tags)
+        for tag in self._apply_clean_tags_to_image(filename, clean_tags, replace=False):
+            self.add_tag(tag)
+    
+    def _apply_clean_tags_to_image(self, filename: str, clean_tags: List[str], replace: bool) -> List[str]:
+        """Store already-stripped tags for an image and return the tags newly added to it"""
+        if replace:
+            # Store tags in original order - sorting happens in get_tags_for_image
+            old_tags = self.image_tags.get(filename)
+            if old_tags == clean_tags:
+                # Same list: nothing to index or journal
+                return []
+            self.image_tags[filename] = clean_tags
+            
+            # Update the inverted index with only the tags that changed
+            if old_tags:
+                new_set = set(clean_tags)
+                self._unindex_tags(filename, (tag for tag in old_tags if tag not in new_set))
+                self._total_assignments -= len(old_tags)
+            self._index_tags(filename, clean_tags)
+            self._total_assignments += len(clean_tags)
+            added_tags = clean_tags
+        else:
+            existing_tags = self.image_tags.setdefault(filename, [])
+            seen = set(existing_tags)
+            added_tags = []
+            for tag in clean_tags:
+                if tag not in seen:
+                    existing_tags.append(tag)
+                    seen.add(tag)
+                    added_tags.append(tag)
+            if not added_tags:
+                return added_tags
+            self._index_tags(filename, added_tags)
+            self._total_assignments += len(added_tags)
+        
+        self._mark_changed((filename,))
+        return added_tags
     
     def remove_tag_from_image(self, filename: str, tag: str):
         """Remove a specific tag from an image"""
         if filename in self.image_tags and tag in self.image_tags[filename]:
             self.image_tags[filename].remove(tag)
+            if tag not in self.image_tags[filename]:
+                self._unindex_tags(filename, (tag,))
+            self._total_assignments -= 1
+            self._mark_changed((filename,))
     
     def get_all_tags(self) -> List[str]:
         """Get all available tags sorted alphabetically"""
@@ -126,73 +262,122 @@ class TagManager:
     
     def get_tags_by_category(self) -> Dict[str, List[str]]:
         """Get tags organized by category"""
-        return self.tag_categories.copy()
+        return {category: sorted(tags) for category, tags in self.tag_categories.items()}
     
     def parse_tags_from_text(self, text: str) -> List[str]:
         """Parse tags from comma or semicolon separated text"""
         if not text.strip():
             return []
         
-        # Split by comma or semicolon, handle multiple spaces
-        tags = re.split(r'[,;]\s*', text.strip())
+        # Split by comma or semicolon
+        parts = text.translate(_TAG_DELIMITER_TRANS).split(',')
         
         # Clean up tags (strip whitespace, remove empty, normalize)
         clean_tags = []
-        for tag in tags:
-            tag = tag.strip()
-            if tag:
-                # Normalize whitespace within tags
-                tag = re.sub(r'\s+', ' ', tag)
-                clean_tags.append(tag)
+        for part in parts:
+            # str.split() both strips and collapses internal whitespace runs
+            words = part.split()
+            if words:
+                clean_tags.append(words[0] if len(words) == 1 else ' '.join(words))
         
         return clean_tags
     
     def format_tags_for_description(self, tags: List[str]) -> str:
         """Format tags for traditional description text, with keyword first"""
-        sorted_tags = self._sort_tags_with_keyword_first(tags)
-        return ", ".join(sorted_tags)
+        return ", ".join(self._iter_keyword_first(tags))
     
     def get_image_count_for_tag(self, tag: str) -> int:
         """Get the number of images that have this tag"""
-        count = 0
-        for tags in self.image_tags.values():
-            if tag in tags:
-                count += 1
-        return count
+        return len(self._tag_to_images.get(tag, ()))
     
     def get_unused_tags(self) -> List[str]:
         """Get tags that aren't applied to any images"""
-        used_tags = set()
-        for tags in self.image_tags.values():
-            used_tags.update(tags)
-        return sorted(list(self.available_tags - used_tags))
+        return sorted(self.available_tags - self._tag_to_images.keys())
     
     def apply_tags_to_multiple_images(self, filenames: List[str], tags: List[str], replace: bool = False):
         """Apply tags to multiple images"""
+        if not filenames:
+            return
+        
+        # Strip the shared tag list once rather than once per image
+        clean_tags = _clean_tags(tags)
+        
+        new_tags = set()
         for filename in filenames:
             if replace:
-                self.apply_tags_to_image(filename, tags)
+                # Each image gets its own list since add_tags_to_image extends in place
+                self._apply_clean_tags_to_image(filename, list(clean_tags), replace=True)
             else:
-                self.add_tags_to_image(filename, tags)
+                new_tags.update(self._apply_clean_tags_to_image(filename, clean_tags, replace=False))
+        
+        # Register each tag once instead of once per image
+        for tag in (clean_tags if replace else new_tags):
+            self.add_tag(tag)
     
     def clear_tags_from_image(self, filename: str):
         """Remove all tags from an image"""
         if filename in self.image_tags:
-            del self.image_tags[filename]
+            tags = self.image_tags.pop(filename)
+            self._unindex_tags(filename, tags)
+            self._total_assignments -= len(tags)
+            self._mark_changed((filename,))
     
     def rename_image(self, old_filename: str, new_filename: str):
         """Update tag mapping when an image is renamed"""
         if old_filename in self.image_tags:
-            self.image_tags[new_filename] = self.image_tags[old_filename]
-            del self.image_tags[old_filename]
+            tags = self.image_tags.pop(old_filename)
+            self._unindex_tags(old_filename, tags)
+            
+            # Drop whatever the target name carried before it is overwritten
+            replaced_tags = self.image_tags.pop(new_filename, None)
+            if replaced_tags is not None:
+                self._unindex_tags(new_filename, replaced_tags)
+                self._total_assignments -= len(replaced_tags)
+            
+            self.image_tags[new_filename] = tags
+            self._index_tags(new_filename, tags)
+            self._mark_changed((old_filename, new_filename))
     
     def remove_image(self, filename: str):
         """Remove an image from tag mappings"""
         if filename in self.image_tags:
-            del self.image_tags[filename]
+            tags = self.image_tags.pop(filename)
+            self._unindex_tags(filename, tags)
+            self._total_assignments -= len(tags)
+            self._mark_changed((filename,))
     
-    def save_tags_to_project(self):
-        """Save tags and mappings to project folder"""
+    def _index_tags(self, filename: str, tags):
+        """Record filename under each tag in the inverted index"""
+        index = self._tag_to_images
+        for tag in tags:
+            filenames = index.get(tag)
+            if filenames is None:
+                index[tag] = {filename}
+            else:
+                filenames.add(filename)
+    
+    def _unindex_tags(self, filename: str, tags):
+        """Drop filename from each tag's entry in the inverted index"""
+        index = self._tag_to_images
+        for tag in tags:
+            filenames = index.get(tag)
+            if filenames is not None:
+                filenames.discard(filename)
+                if not filenames:
+                    del index[tag]
+    
+    def _rebuild_index(self):
+        """Rebuild the inverted index from image_tags in a single pass"""
+        self._tag_to_images = {}
+        total_assignments = 0
+        for filename, tags in self.image_tags.items():
+            self._index_tags(filename, tags)
+            total_assignments += len(tags)
+        self._total_assignments = total_assignments
+        self._mark_changed()
+    
+    def save_tags_to_project(self, pretty: bool = False):
+        """Save tags and mappings to project folder (compact JSON unless pretty is set)"""
         if not self.project_folder:
             return False, "No project folder set"
         
@@ -200,16 +385,36 @@ class TagManager:
             # Create tags data structure
             tags_data = {
                 'available_tags': list(self.available_tags),
-                'tag_categories': self.tag_categories,
+                'tag_categories': self.get_tags_by_category(),
                 'image_tags': self.image_tags,
                 'keyword_tag': self.keyword_tag,  # Save keyword tag
                 'version': '2.0'  # Increment version for keyword support
             }
             
-            # Save to tags.json file
+            # Serialize in one call and write the bytes with a single write
+            payload_bytes = _dump_json_bytes(tags_data, pretty)
+            
+            # Skip the write entirely if the file already holds exactly this content
             tags_file = os.path.join(self.project_folder, 'tags.json')
-            with open(tags_file, 'w', encoding='utf-8') as f:
-                json.dump(tags_data, f, indent=2, ensure_ascii=False)
+            payload_hash = blake2b(payload_bytes, digest_size=16).digest()
+            if payload_hash == self._last_saved_hash and os.path.exists(tags_file):
+                self._reset_journal()
+                return True, f"Tags unchanged in {tags_file}"
+            
+            # Write to a temp file and swap it in, so a crash never leaves a partial tags.json
+            tmp_file = tags_file + '.tmp'
+            try:
+                with open(tmp_file, 'wb') as f:
+                    f.write(payload_bytes)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, tags_file)
+            except Exception:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+                raise
+            self._last_saved_hash = payload_hash
+            self._reset_journal()
             
             return True, f"Tags saved to {tags_file}"
         
@@ -226,39 +431,207 @@ class TagManager:
             return False, "No tags file found"
         
         try:
-            with open(tags_file, 'r', encoding='utf-8') as f:
-                tags_data = json.load(f)
+            if ijson is not None and os.path.getsize(tags_file) > _STREAM_LOAD_THRESHOLD:
+                self._stream_load_tags(tags_file)
+            else:
+                # Read the whole file at once so the parser works on one buffer
+                with open(tags_file, 'rb') as f:
+                    raw = f.read()
+                tags_data = _load_json_bytes(raw)
+                
+                # Load data
+                self.available_tags = set(tags_data.get('available_tags', []))
+                self.tag_categories = {category: set(tags) for category, tags in tags_data.get('tag_categories', {}).items()}
+                # Intern tag strings so repeated tags across images share one object
+                intern = sys.intern
+                self.image_tags = {filename: list(map(intern, tags))
+                                   for filename, tags in tags_data.get('image_tags', {}).items()}
+                self.keyword_tag = tags_data.get('keyword_tag', None)  # Load keyword tag
+                self._rebuild_index()
+                self._last_saved_hash = blake2b(raw, digest_size=16).digest()
             
-            # Load data
-            self.available_tags = set(tags_data.get('available_tags', []))
-            self.tag_categories = tags_data.get('tag_categories', {})
-            self.image_tags = tags_data.get('image_tags', {})
-            self.keyword_tag = tags_data.get('keyword_tag', None)  # Load keyword tag
+            # Apply changes journaled since tags.json was last written in full
+            if self._replay_journal():
+                self._rebuild_index()
+            self._dirty_images.clear()
+            self._meta_dirty = False
             
             return True, f"Tags loaded from {tags_file}"
         
         except Exception as e:
             return False, f"Error loading tags: {str(e)}"
     
+    def save_tag_changes(self):
+        """Append tag changes since the last save to the journal instead of rewriting tags.json"""
+        if not self.project_folder:
+            return False, "No project folder set"
+        
+        tags_file = os.path.join(self.project_folder, 'tags.json')
+        if self._last_saved_hash is None or not os.path.exists(tags_file):
+            # Nothing on disk to journal against yet
+            return self.save_tags_to_project()
+        
+        if not self._dirty_images and not self._meta_dirty:
+            return True, f"Tags unchanged in {tags_file}"
+        
+        # One record per changed image, carrying its full tag list (or its removal)
+        image_tags = self.image_tags
+        records = []
+        for filename in self._dirty_images:
+            tags = image_tags.get(filename)
+            if tags is None:
+                records.append({'op': 'remove', 'fn': filename})
+            else:
+                records.append({'op': 'apply', 'fn': filename, 'tags': tags})
+        if self._meta_dirty:
+            records.append({
+                'op': 'meta',
+                'available_tags': list(self.available_tags),
+                'tag_categories': self.get_tags_by_category(),
+                'keyword_tag': self.keyword_tag
+            })
+        
+        journal_file = os.path.join(self.project_folder, _JOURNAL_FILENAME)
+        payload = b''.join(_dump_json_bytes(record) + b'\n' for record in records)
+        try:
+            with open(journal_file, 'a+b') as f:
+                # Start on a fresh line even if the last append lost its newline
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        payload = b'\n' + payload
+                f.write(payload)
+                f.flush()
+                journal_size = f.tell()
+        except Exception as e:
+            return False, f"Error saving tag changes: {str(e)}"
+        
+        self._dirty_images.clear()
+        self._meta_dirty = False
+        
+        # Compact once the journal outgrows the snapshot it amends
+        if journal_size > os.path.getsize(tags_file):
+            return self.save_tags_to_project()
+        
+        return True, f"Tag changes saved to {journal_file}"
+    
+    def _replay_journal(self) -> int:
+        """Apply journaled changes on top of the loaded tags.json; returns the records applied"""
+        journal_file = os.path.join(self.project_folder, _JOURNAL_FILENAME)
+        if not os.path.exists(journal_file):
+            return 0
+        
+        image_tags = self.image_tags
+        intern = sys.intern
+        applied = 0
+        torn_offset = None
+        with open(journal_file, 'rb') as f:
+            for line in iter(f.readline, b''):
+                if not line.strip():
+                    continue
+                try:
+                    record = _load_json_bytes(line)
+                except ValueError:
+                    # A torn final line from an interrupted append; everything before it is valid
+                    torn_offset = f.tell() - len(line)
+                    break
+                
+                op = record.get('op')
+                if op == 'apply':
+                    image_tags[record['fn']] = list(map(intern, record['tags']))
+                elif op == 'remove':
+                    image_tags.pop(record['fn'], None)
+                elif op == 'meta':
+                    self.available_tags = set(record.get('available_tags', []))
+                    self.tag_categories = {category: set(tags) for category, tags in record.get('tag_categories', {}).items()}
+                    self.keyword_tag = record.get('keyword_tag', None)
+                applied += 1
+        
+        if torn_offset is not None:
+            # Cut the torn tail off so later appends are not stranded behind it
+            os.truncate(journal_file, torn_offset)
+        
+        return applied
+    
+    def _reset_journal(self):
+        """Drop the journal once tags.json holds the full current state"""
+        self._dirty_images.clear()
+        self._meta_dirty = False
+        journal_file = os.path.join(self.project_folder, _JOURNAL_FILENAME)
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+    
+    def _stream_load_tags(self, tags_file: str):
+        """Stream tags.json into the tag structures without building the whole document"""
+        # Parse into locals and swap them in only once the whole file has been read
+        image_tags = {}
+        tag_to_images = {}
+        total_assignments = 0
+        hasher = blake2b(digest_size=16)
+        intern = sys.intern
+        
+        with open(tags_file, 'rb') as f:
+            # Index each image as it is parsed instead of rebuilding afterwards
+            for filename, tags in ijson.kvitems(f, 'image_tags'):
+                tags = list(map(intern, tags))
+                image_tags[filename] = tags
+                for tag in tags:
+                    filenames = tag_to_images.get(tag)
+                    if filenames is None:
+                        tag_to_images[tag] = {filename}
+                    else:
+                        filenames.add(filename)
+                total_assignments += len(tags)
+            
+            f.seek(0)
+            available_tags = set(ijson.items(f, 'available_tags.item'))
+            f.seek(0)
+            tag_categories = {category: set(tags) for category, tags in ijson.kvitems(f, 'tag_categories')}
+            f.seek(0)
+            keyword_tag = next(ijson.items(f, 'keyword_tag'), None)
+            
+            # Hash in chunks so unchanged-save detection still works
+            f.seek(0)
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        
+        self.available_tags = available_tags
+        self.tag_categories = tag_categories
+        self.image_tags = image_tags
+        self._tag_to_images = tag_to_images
+        self.keyword_tag = keyword_tag
+        self._total_assignments = total_assignments
+        self._mark_changed()
+        self._last_saved_hash = hasher.digest()
+    
     def migrate_from_text_descriptions(self, image_data_list: List[Dict]):
         """Convert text descriptions to tags for existing datasets"""
+        parse_tags = self.parse_tags_from_text
+        apply_tags = self.apply_tags_to_image
+        
+        # Count described images in the same pass instead of re-reading every description
+        described_count = 0
         for img_data in image_data_list:
             description = img_data.get('description', '')
             if description.strip():
-                tags = self.parse_tags_from_text(description)
+                described_count += 1
+                tags = parse_tags(description)
                 if tags:
-                    self.apply_tags_to_image(img_data['filename'], tags)
+                    apply_tags(img_data['filename'], tags)
         
-        return len([img for img in image_data_list if img.get('description', '').strip()])
+        return described_count
     
     def export_to_text_descriptions(self, image_data_list: List[Dict]):
         """Convert tags back to text descriptions for compatibility"""
+        image_tags = self.image_tags
+        sort_tags = self._sort_tags_with_keyword_first
+        
         updated_count = 0
         for img_data in image_data_list:
-            filename = img_data['filename']
-            tags = self.get_tags_for_image(filename)  # This will sort with keyword first
+            tags = image_tags.get(img_data['filename'])
             if tags:
-                img_data['description'] = self.format_tags_for_description(tags)
+                # Sort once here rather than again inside format_tags_for_description
+                img_data['description'] = ", ".join(sort_tags(tags))
                 updated_count += 1
             elif not img_data.get('description'):
                 img_data['description'] = ""
@@ -266,18 +639,26 @@ class TagManager:
         return updated_count
     
     def get_statistics(self) -> Dict[str, int]:
-        """Get tag usage statistics"""
-        return {
-            'total_tags': len(self.available_tags),
-            'total_images_with_tags': len([f for f in self.image_tags if self.image_tags[f]]),
-            'total_tag_assignments': sum(len(tags) for tags in self.image_tags.values()),
-            'unused_tags': len(self.get_unused_tags()),
-            'has_keyword_tag': 1 if self.keyword_tag else 0
-        }
+        """Get tag usage statistics (recomputed only after a mutation)"""
+        if self._stats_dirty or self._cached_stats is None:
+            self._cached_stats = {
+                'total_tags': len(self.available_tags),
+                # map(bool, ...) keeps the reduction in C rather than a generator loop
+                'total_images_with_tags': sum(map(bool, self.image_tags.values())),
+                'total_tag_assignments': self._total_assignments,
+                'unused_tags': len(self.available_tags - self._tag_to_images.keys()),
+                'has_keyword_tag': 1 if self.keyword_tag else 0
+            }
+            self._stats_dirty = False
+        return self._cached_stats.copy()
     
     def clear_all_tags(self):
         """Clear all tags and tag assignments"""
+        cleared_images = list(self.image_tags)
         self.available_tags.clear()
         self.tag_categories.clear()
         self.image_tags.clear()
-        self.keyword_tag = None
\ No newline at end of file
+        self._tag_to_images.clear()
+        self._total_assignments = 0
+        self.keyword_tag = None
+        self._mark_changed(cleared_images, meta=True)
\ No newline at end of file
@@ -5,14 +5,210 @@ Contains tab classes and custom widgets with improved tag system
 """
 
 import re
+from functools import lru_cache
 from PyQt6.QtWidgets import (
     QWidget, QPushButton, QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, 
     QTableWidget, QTableWidgetItem, QSplitter, QTextEdit, QHeaderView,
     QTabWidget, QGroupBox, QFrame, QRadioButton, QButtonGroup, QScrollArea,
-    QApplication, QSizePolicy, QCheckBox
+    QApplication, QSizePolicy, QCheckBox, QStyledItemDelegate, QStyleOptionViewItem, QStyle, QLayout,
+    QProgressBar, QComboBox, QFormLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QPalette, QFont, QPainter, QBrush, QPen, QColor
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QRect, QPoint, QEvent, QTimer
+from PyQt6.QtGui import QPalette, QFont, QFontMetrics, QPainter, QBrush, QPen, QColor, QPixmap, QPixmapCache
+from PyQt6 import sip
+
+
+# Splits tag input on commas or semicolons (and the whitespace after them)
+_TAG_SPLIT_RE = re.compile(r'[,;]\s*')
+
+# One QFontMetrics per chip font size, built on first use
+_chip_font_metrics = {}
+
+
+@lru_cache(maxsize=4096)
+def _tag_text_width(text: str, font_size: int) -> int:
+    """Width of text in the chip font; memoized since the same tags are measured repeatedly"""
+    fm = _chip_font_metrics.get(font_size)
+    if fm is None:
+        fm = QFontMetrics(QFont("Arial", font_size, QFont.Weight.Medium))
+        _chip_font_metrics[font_size] = fm
+    return fm.boundingRect(text).width()
+
+
+# Chip colors per state as (background, hovered background, border, text), built once at import
+_CHIP_SELECTED_COLORS = (QColor(76, 175, 80), QColor(76, 175, 80).darker(110),   # #4CAF50 green
+                         QColor(56, 142, 60), QColor(255, 255, 255))             # #388E3C, white
+_CHIP_KEYWORD_COLORS = (QColor(244, 67, 54), QColor(244, 67, 54).darker(110),    # #F44336 red
+                        QColor(211, 47, 47), QColor(255, 255, 255))              # #D32F2F, white
+_CHIP_NORMAL_COLORS = (QColor(245, 245, 245), QColor(245, 245, 245).darker(110), # #F5F5F5 gray
+                       QColor(204, 204, 204), QColor(51, 51, 51))                # #CCCCCC, #333333
+_CHIP_BUTTON_BG = QColor(255, 255, 255, 77)         # More transparent
+_CHIP_BUTTON_HOVER_BG = QColor(255, 255, 255, 128)  # Semi-transparent white
+
+# (text font, remove-button font) per chip font size, built on first use
+_chip_fonts = {}
+
+
+def _chip_remove_button_rect(rect: QRect) -> QRect:
+    """Rectangle of the remove button within a chip occupying rect"""
+    return rect.adjusted(rect.width() - 25, 6, -5, -6)
+
+
+def _paint_chip(painter: QPainter, rect: QRect, text: str, *, selected: bool, is_keyword: bool,
+                hovered: bool, remove_hovered: bool, removable: bool, font_size: int):
+    """Draw a tag chip in the given state into rect; the painter should have antialiasing on"""
+    fonts = _chip_fonts.get(font_size)
+    if fonts is None:
+        fonts = (QFont("Arial", font_size, QFont.Weight.Medium), QFont("Arial", font_size, QFont.Weight.Bold))
+        _chip_fonts[font_size] = fonts
+    text_font, button_font = fonts
+    
+    # Determine colors based on state
+    if selected:
+        bg_color, hover_bg_color, border_color, text_color = _CHIP_SELECTED_COLORS
+    elif is_keyword:
+        bg_color, hover_bg_color, border_color, text_color = _CHIP_KEYWORD_COLORS
+    else:
+        bg_color, hover_bg_color, border_color, text_color = _CHIP_NORMAL_COLORS
+    
+    # Slightly darken if hovered
+    if hovered and not (selected or is_keyword):
+        bg_color = hover_bg_color
+    
+    # Draw background
+    painter.setBrush(QBrush(bg_color))
+    painter.setPen(QPen(border_color, 2))
+    painter.drawRoundedRect(rect, 16, 16)
+    
+    # Draw text
+    painter.setPen(QPen(text_color))
+    painter.setFont(text_font)
+    
+    text_rect = rect.adjusted(10, 0, -30 if removable else -10, 0)
+    painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
+    
+    # Draw remove button if removable
+    if removable:
+        button_rect = _chip_remove_button_rect(rect)
+        
+        # Button background
+        button_bg = _CHIP_BUTTON_HOVER_BG if remove_hovered else _CHIP_BUTTON_BG
+        
+        # The faint button fill doesn't need antialiasing; only the outline and glyph do
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setBrush(QBrush(button_bg))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(button_rect, 10, 10)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        
+        # X symbol
+        painter.setPen(QPen(text_color, 2))
+        painter.setFont(button_font)
+        painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, "×")
+
+
+class FlowLayout(QLayout):
+    """A height-for-width layout that places items left to right, wrapping onto new rows"""
+    
+    def __init__(self, parent=None, spacing=6, margin=6):
+        super().__init__(parent)
+        self._items = []
+        self._spacing = spacing
+        self._margin = margin  # kept free at the right edge and doubled below the last row
+        self._height_for_width = None  # (width, height) of the last heightForWidth answer
+        self.setContentsMargins(0, 0, 0, 0)
+    
+    def addItem(self, item):
+        self._items.append(item)
+    
+    def count(self):
+        return len(self._items)
+    
+    def itemAt(self, index):
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+    
+    def takeAt(self, index):
+        if 0 <= index < len(self._items):
+            return self._items.pop(index)
+        return None
+    
+    def take_all(self):
+        """Remove every item in one step and return the widgets they held"""
+        items = self._items
+        self._items = []
+        widgets = [item.widget() for item in items]
+        # The layout owns its QWidgetItem wrappers on the C++ side; free them
+        # here as QLayout::removeWidget would, leaving the widgets themselves alone
+        for item in items:
+            sip.delete(item)
+        self.invalidate()
+        return widgets
+    
+    def invalidate(self):
+        """Drop the cached height whenever items change"""
+        self._height_for_width = None
+        super().invalidate()
+    
+    def expandingDirections(self):
+        return Qt.Orientation(0)
+    
+    def hasHeightForWidth(self):
+        return True
+    
+    def heightForWidth(self, width):
+        cached = self._height_for_width
+        if cached is not None and cached[0] == width:
+            return cached[1]
+        height = self._do_layout(QRect(0, 0, width, 0), apply=False)
+        self._height_for_width = (width, height)
+        return height
+    
+    def setGeometry(self, rect):
+        """Position every item in one pass"""
+        super().setGeometry(rect)
+        self._do_layout(rect, apply=True)
+    
+    def sizeHint(self):
+        return self.minimumSize()
+    
+    def minimumSize(self):
+        # Wide enough for the widest item; the height comes from heightForWidth
+        size = QSize(0, 50)
+        for item in self._items:
+            size = size.expandedTo(item.minimumSize())
+        return size
+    
+    def _do_layout(self, rect, apply):
+        """Flow items across rect, optionally setting their geometry; returns the content height"""
+        left = rect.x()
+        right = rect.x() + (rect.width() or 400) - self._margin
+        x, y = left, rect.y()
+        row_height = 0
+        spacing = self._spacing
+        
+        for item in self._items:
+            item_size = item.sizeHint()
+            item_width = item_size.width()
+            
+            # Check if item fits on current row
+            if x + item_width > right and x > left:
+                # Move to next row
+                x = left
+                y += row_height + spacing
+                row_height = 0
+            
+            if apply:
+                item.setGeometry(QRect(QPoint(x, y), item_size))
+            
+            # Update row tracking
+            x += item_width + spacing
+            row_height = max(row_height, item_size.height())
+        
+        if not self._items:
+            return 50
+        return max(50, y - rect.y() + row_height + self._margin * 2)
 
 
 class FlowWidget(QWidget):
@@ -22,66 +218,36 @@ class FlowWidget(QWidget):
         super().__init__(parent)
         self.spacing = spacing
         self.widgets = []
-        self.setMinimumHeight(50)
+        self.flow_layout = FlowLayout(self, spacing=spacing)
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
         
     def addWidget(self, widget):
         """Add a widget to the flow layout"""
-        widget.setParent(self)
         self.widgets.append(widget)
-        self.updateLayout()
+        self.flow_layout.addWidget(widget)
+    
+    def addWidgets(self, widgets):
+        """Add several widgets with painting suspended until all are placed"""
+        self.setUpdatesEnabled(False)
+        try:
+            for widget in widgets:
+                self.addWidget(widget)
+        finally:
+            self.setUpdatesEnabled(True)
         
     def removeWidget(self, widget):
         """Remove a widget from the flow layout"""
         if widget in self.widgets:
             self.widgets.remove(widget)
+            self.flow_layout.removeWidget(widget)
             widget.setParent(None)
-            self.updateLayout()
             
     def clear(self):
         """Remove all widgets"""
-        for widget in self.widgets[:]:
-            self.removeWidget(widget)
-            
-    def updateLayout(self):
-        """Update the layout of all widgets"""
-        if not self.widgets:
-            self.setMinimumHeight(50)
-            return
-            
-        container_width = self.width() or 400
-        x, y = 0, 0
-        row_height = 0
-        margin = 6
-        
-        for widget in self.widgets:
-            widget.show()
-            widget_size = widget.sizeHint()
-            widget_width = widget_size.width()
-            widget_height = widget_size.height()
-            
-            # Check if widget fits on current row
-            if x + widget_width > container_width - margin and x > 0:
-                # Move to next row
-                x = 0
-                y += row_height + self.spacing
-                row_height = 0
-                
-            # Position widget
-            widget.move(x, y)
-            widget.resize(widget_width, widget_height)
-            
-            # Update row tracking
-            x += widget_width + self.spacing
-            row_height = max(row_height, widget_height)
-            
-        # Set minimum height based on content
-        total_height = y + row_height + margin * 2
-        self.setMinimumHeight(max(50, total_height))
-        
-    def resizeEvent(self, event):
-        """Handle resize events"""
-        super().resizeEvent(event)
-        self.updateLayout()
+        self.flow_layout.take_all()
+        widgets, self.widgets = self.widgets, []
+        for widget in widgets:
+            widget.setParent(None)
 
 
 class TagChip(QWidget):
@@ -104,22 +270,12 @@ class TagChip(QWidget):
         self.hovered = False
         self.remove_hovered = False
         
-        # Calculate size based on text
-        font = QFont("Arial", self.font_size, QFont.Weight.Medium)
-        fm = self.fontMetrics()
-        text_width = fm.boundingRect(self.tag_text).width()
+        # Fixed size from the text; the chip never resizes afterwards
+        self._size_hint = TagChip.chip_size(self.tag_text, self.font_size, self.removable)
+        self.setFixedSize(self._size_hint)
+        self.setFont(QFont("Arial", self.font_size, QFont.Weight.Medium))
         
-        # Set fixed size
-        padding = 20
-        button_width = 20 if self.removable else 0
-        total_width = text_width + padding + button_width
-        height = max(32, self.font_size + 20)
-        
-        self.setFixedSize(total_width, height)
-        self.setFont(font)
-        
-        # Enable mouse tracking for hover effects
-        self.setMouseTracking(True)
+        # Mouse tracking is switched on only while the cursor is over a removable chip (see enterEvent)
         
         # Enable context menu for keyword selection
         if self.selectable:
@@ -140,65 +296,59 @@ class TagChip(QWidget):
         
         menu.exec(self.mapToGlobal(position))
     
+    @staticmethod
+    def chip_size(tag_text: str, font_size: int, removable: bool) -> QSize:
+        """Size of a chip showing tag_text (shared by TagChip and TagCellDelegate)"""
+        text_width = _tag_text_width(tag_text, font_size)
+        padding = 20
+        button_width = 20 if removable else 0
+        return QSize(text_width + padding + button_width, max(32, font_size + 20))
+    
+    @staticmethod
+    def remove_button_rect(rect: QRect) -> QRect:
+        """Rectangle of the remove button within a chip occupying rect"""
+        return _chip_remove_button_rect(rect)
+    
+    @classmethod
+    def chip_pixmap(cls, tag_text: str, size: QSize, font_size: int, removable: bool, selected: bool,
+                    is_keyword: bool, hovered: bool, remove_hovered: bool, ratio: float) -> QPixmap:
+        """Return the rendered chip from the shared pixmap cache, rendering it on first use"""
+        # Selected and keyword chips don't change color on hover, so share one entry
+        hovered = hovered and not (selected or is_keyword)
+        state_bits = (selected << 3) | (is_keyword << 2) | (hovered << 1) | remove_hovered
+        # Keyed by content so every chip and table cell showing the same tag shares one bitmap
+        key = f"tagchip:{tag_text}:{size.width()}x{size.height()}:{font_size}:{removable:d}:{state_bits}:{ratio}"
+        
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = cls._render_chip(tag_text, size, font_size, removable, selected,
+                                      is_keyword, hovered, remove_hovered, ratio)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
     def paintEvent(self, event):
-        """Custom paint the tag chip with proper colors"""
+        """Paint the tag chip from the shared pixmap cache"""
+        pixmap = TagChip.chip_pixmap(self.tag_text, self._size_hint, self.font_size, self.removable, self.selected,
+                                     self.is_keyword, self.hovered, self.remove_hovered, self.devicePixelRatioF())
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+    
+    @staticmethod
+    def _render_chip(tag_text: str, size: QSize, font_size: int, removable: bool, selected: bool,
+                     is_keyword: bool, hovered: bool, remove_hovered: bool, ratio: float) -> QPixmap:
+        """Render a chip in the given state into a transparent pixmap"""
+        pixmap = QPixmap(round(size.width() * ratio), round(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        rect = self.rect()
-        
-        # Determine colors based on state
-        if self.selected:
-            # Green for selected
-            bg_color = QColor(76, 175, 80)  # #4CAF50
-            border_color = QColor(56, 142, 60)  # #388E3C
-            text_color = QColor(255, 255, 255)  # White
-        elif self.is_keyword:
-            # Red for keyword
-            bg_color = QColor(244, 67, 54)  # #F44336
-            border_color = QColor(211, 47, 47)  # #D32F2F
-            text_color = QColor(255, 255, 255)  # White
-        else:
-            # Gray for normal
-            bg_color = QColor(245, 245, 245)  # #F5F5F5
-            border_color = QColor(204, 204, 204)  # #CCCCCC
-            text_color = QColor(51, 51, 51)  # #333333
-        
-        # Slightly darken if hovered
-        if self.hovered and not (self.selected or self.is_keyword):
-            bg_color = bg_color.darker(110)
-        
-        # Draw background
-        painter.setBrush(QBrush(bg_color))
-        painter.setPen(QPen(border_color, 2))
-        painter.drawRoundedRect(rect, 16, 16)
-        
-        # Draw text
-        painter.setPen(QPen(text_color))
-        font = QFont("Arial", self.font_size, QFont.Weight.Medium)
-        painter.setFont(font)
-        
-        text_rect = rect.adjusted(10, 0, -30 if self.removable else -10, 0)
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self.tag_text)
-        
-        # Draw remove button if removable
-        if self.removable:
-            button_rect = rect.adjusted(rect.width() - 25, 6, -5, -6)
-            
-            # Button background
-            if self.remove_hovered:
-                button_bg = QColor(255, 255, 255, 128)  # Semi-transparent white
-            else:
-                button_bg = QColor(255, 255, 255, 77)   # More transparent
-            
-            painter.setBrush(QBrush(button_bg))
-            painter.setPen(QPen(QColor(0, 0, 0, 0)))  # No border
-            painter.drawRoundedRect(button_rect, 10, 10)
-            
-            # X symbol
-            painter.setPen(QPen(text_color, 2))
-            painter.setFont(QFont("Arial", self.font_size, QFont.Weight.Bold))
-            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, "×")
+        _paint_chip(painter, QRect(QPoint(0, 0), size), tag_text, selected=selected, is_keyword=is_keyword,
+                    hovered=hovered, remove_hovered=remove_hovered, removable=removable, font_size=font_size)
+        painter.end()
+        return pixmap
     
     def mousePressEvent(self, event):
         """Handle mouse clicks"""
@@ -224,24 +374,45 @@ class TagChip(QWidget):
         else:
             self.remove_hovered = False
         
-        # Repaint if hover state changed
-        if (was_hovered != self.hovered or was_remove_hovered != self.remove_hovered):
-            self.update()
+        self._update_hover_region(was_hovered, was_remove_hovered)
         
         super().mouseMoveEvent(event)
     
+    def enterEvent(self, event):
+        """Handle mouse entering widget"""
+        was_hovered = self.hovered
+        was_remove_hovered = self.remove_hovered
+        self.hovered = True
+        if self.removable:
+            # Move events are only needed to follow the cursor onto the remove button
+            self.setMouseTracking(True)
+            self.remove_hovered = self.get_remove_button_rect().contains(event.position().toPoint())
+        self._update_hover_region(was_hovered, was_remove_hovered)
+        super().enterEvent(event)
+    
     def leaveEvent(self, event):
         """Handle mouse leaving widget"""
+        self.setMouseTracking(False)
         if self.hovered or self.remove_hovered:
+            was_hovered = self.hovered
+            was_remove_hovered = self.remove_hovered
             self.hovered = False
             self.remove_hovered = False
-            self.update()
+            self._update_hover_region(was_hovered, was_remove_hovered)
         super().leaveEvent(event)
     
+    def _update_hover_region(self, was_hovered: bool, was_remove_hovered: bool):
+        """Repaint only the area whose appearance a hover change affects"""
+        if was_hovered != self.hovered and not (self.selected or self.is_keyword):
+            # Hover darkening covers the whole chip background
+            self.update()
+        elif was_remove_hovered != self.remove_hovered:
+            self.update(self.get_remove_button_rect())
+        # Selected and keyword chips don't darken on hover, so nothing else needs painting
+    
     def get_remove_button_rect(self):
         """Get the rectangle of the remove button"""
-        rect = self.rect()
-        return rect.adjusted(rect.width() - 25, 6, -5, -6)
+        return TagChip.remove_button_rect(self.rect())
     
     def set_selected(self, selected: bool):
         """Set the selected state and repaint"""
@@ -260,8 +431,8 @@ class TagChip(QWidget):
         return self.tag_text
     
     def sizeHint(self):
-        """Provide size hint for layout calculations"""
-        return self.size()
+        """Provide size hint for layout calculations; the chip is fixed-size, so this never changes"""
+        return self._size_hint
 
 
 class CurrentImageTagsWidget(QWidget):
@@ -304,6 +475,10 @@ class CurrentImageTagsWidget(QWidget):
         self.tags_flow_widget = FlowWidget(spacing=8)
         scroll_area.setWidget(self.tags_flow_widget)
         
+        # Placeholder shown instead of chips; built once and re-added as needed
+        self._placeholder_label = QLabel()
+        self._placeholder_label.setStyleSheet("color: #666; font-style: italic; padding: 15px; font-size: 12px;")
+        
         tags_layout.addWidget(scroll_area)
         layout.addWidget(tags_group)
         
@@ -314,7 +489,7 @@ class CurrentImageTagsWidget(QWidget):
     def set_image_tags(self, filename: str, tags: list):
         """Set the current image and its tags"""
         self.current_filename = filename
-        self.current_tags = tags.copy()
+        self.current_tags = list(tags)
         self.refresh_tag_display()
         
     def clear_display(self):
@@ -330,26 +505,30 @@ class CurrentImageTagsWidget(QWidget):
         
         if not self.current_filename:
             # No image selected
-            no_selection_label = QLabel("No image selected")
-            no_selection_label.setStyleSheet("color: #666; font-style: italic; padding: 15px; font-size: 12px;")
-            self.tags_flow_widget.addWidget(no_selection_label)
+            self._placeholder_label.setText("No image selected")
+            self.tags_flow_widget.addWidget(self._placeholder_label)
             return
             
         if not self.current_tags:
             # No tags for this image
-            no_tags_label = QLabel(f"No tags for {self.current_filename}")
-            no_tags_label.setStyleSheet("color: #666; font-style: italic; padding: 15px; font-size: 12px;")
-            self.tags_flow_widget.addWidget(no_tags_label)
+            self._placeholder_label.setText(f"No tags for {self.current_filename}")
+            self.tags_flow_widget.addWidget(self._placeholder_label)
             return
         
-        # Create tag chips with improved flow layout
+        # Create tag chips with improved flow layout, adding them in one batch
+        keyword_tag = self.tag_manager.get_keyword_tag() if self.tag_manager else None
+        chips = []
         for tag in self.current_tags:
-            is_keyword = self.tag_manager.is_keyword_tag(tag) if self.tag_manager else False
             chip = TagChip(tag, removable=True, selectable=False, font_size=self.font_size, 
-                          is_keyword=is_keyword, tag_manager=self.tag_manager)
-            chip.remove_clicked.connect(lambda t=tag: self.tag_removed.emit(self.current_filename, t))
+                          is_keyword=tag == keyword_tag, tag_manager=self.tag_manager)
+            chip.remove_clicked.connect(self._on_chip_remove_clicked)
             chip.keyword_clicked.connect(self.keyword_toggled.emit)
-            self.tags_flow_widget.addWidget(chip)
+            chips.append(chip)
+        self.tags_flow_widget.addWidgets(chips)
+    
+    def _on_chip_remove_clicked(self, tag_text: str):
+        """Forward a chip's remove click with the current filename"""
+        self.tag_removed.emit(self.current_filename, tag_text)
 
 
 class TagInputWidget(QWidget):
@@ -362,8 +541,10 @@ class TagInputWidget(QWidget):
     
     def __init__(self, font_size: int = 12):
         super().__init__()
-        self.available_tags = []
-        self.selected_tags = []
+        self.available_tags = []  # kept sorted so the display never re-sorts
+        self._available_set = set()  # membership mirror of available_tags
+        self.selected_tags = {}  # insertion-ordered set: tag -> None
+        self._chips = {}  # tag_text -> TagChip currently displayed
         self.font_size = font_size
         self.tag_manager = None  # Will be set by parent
         self.setup_ui()
@@ -415,6 +596,10 @@ class TagInputWidget(QWidget):
         self.tags_flow_widget = FlowWidget(spacing=8)
         scroll_area.setWidget(self.tags_flow_widget)
         
+        # Placeholder shown when there are no tags; built once and re-added as needed
+        self._no_tags_label = QLabel("No tags available. Add some tags above.")
+        self._no_tags_label.setStyleSheet("color: #666; font-style: italic; padding: 15px; font-size: 12px;")
+        
         input_layout.addWidget(scroll_area)
         
         # Action buttons with larger fonts
@@ -454,14 +639,16 @@ class TagInputWidget(QWidget):
         if not text:
             return
         
-        # Parse tags from text
-        tags = re.split(r'[,;]\s*', text.strip())
-        new_tags = [tag.strip() for tag in tags if tag.strip()]
+        # Parse tags from text, stripping each part once
+        new_tags = [tag for tag in (part.strip() for part in _TAG_SPLIT_RE.split(text)) if tag]
         
-        # Add to available tags
-        for tag in new_tags:
-            if tag not in self.available_tags:
-                self.available_tags.append(tag)
+        # Add to available tags, keeping the list sorted
+        existing = self._available_set
+        additions = [tag for tag in dict.fromkeys(new_tags) if tag not in existing]
+        if additions:
+            self.available_tags.extend(additions)
+            self.available_tags.sort()
+            existing.update(additions)
         
         # Clear input
         self.tag_input.clear()
@@ -474,112 +661,195 @@ class TagInputWidget(QWidget):
     
     def set_available_tags(self, tags: list):
         """Set the list of available tags"""
-        self.available_tags = tags.copy()
+        self.available_tags = sorted(tags)
+        self._available_set = set(self.available_tags)
         self.refresh_tag_display()
     
     def refresh_tag_display(self):
         """Refresh the visual display of tag chips with flow layout"""
         # Clear existing widgets
         self.tags_flow_widget.clear()
+        self._chips = {}
         
         if not self.available_tags:
-            no_tags_label = QLabel("No tags available. Add some tags above.")
-            no_tags_label.setStyleSheet("color: #666; font-style: italic; padding: 15px; font-size: 12px;")
-            self.tags_flow_widget.addWidget(no_tags_label)
+            self.tags_flow_widget.addWidget(self._no_tags_label)
             return
         
-        # Create tag chips with flow layout
-        for tag in sorted(self.available_tags):
-            is_keyword = self.tag_manager.is_keyword_tag(tag) if self.tag_manager else False
+        # Create tag chips with flow layout, adding them in one batch
+        keyword_tag = self.tag_manager.get_keyword_tag() if self.tag_manager else None
+        for tag in self.available_tags:
             chip = TagChip(tag, removable=True, selectable=True, font_size=self.font_size, 
-                          is_keyword=is_keyword, tag_manager=self.tag_manager)
+                          is_keyword=tag == keyword_tag, tag_manager=self.tag_manager)
             chip.tag_clicked.connect(self.on_tag_clicked)
             chip.remove_clicked.connect(self.remove_tag)
             chip.keyword_clicked.connect(self.keyword_toggled.emit)
             
             # Set selection state
             chip.set_selected(tag in self.selected_tags)
-            self.tags_flow_widget.addWidget(chip)
+            self._chips[tag] = chip
+        self.tags_flow_widget.addWidgets(self._chips.values())
     
     def on_tag_clicked(self, tag_text: str):
         """Handle tag selection/deselection"""
-        if tag_text in self.selected_tags:
-            self.selected_tags.remove(tag_text)
+        selected = tag_text not in self.selected_tags
+        if selected:
+            self.selected_tags[tag_text] = None
         else:
-            self.selected_tags.append(tag_text)
+            del self.selected_tags[tag_text]
         
-        # Update all chips to reflect selection state
-        self.refresh_tag_display()
+        # Only the clicked chip changes; chip sizes don't, so no relayout is needed
+        chip = self._chips.get(tag_text)
+        if chip is not None:
+            chip.set_selected(selected)
+    
+    def refresh_keyword_state(self):
+        """Update the keyword highlight on the existing chips without rebuilding them"""
+        keyword_tag = self.tag_manager.get_keyword_tag() if self.tag_manager else None
+        for tag, chip in self._chips.items():
+            chip.set_keyword(tag == keyword_tag)
     
     def remove_tag(self, tag_text: str):
         """Remove a tag from available tags"""
-        if tag_text in self.available_tags:
+        if tag_text in self._available_set:
             self.available_tags.remove(tag_text)
-        if tag_text in self.selected_tags:
-            self.selected_tags.remove(tag_text)
+            self._available_set.discard(tag_text)
+        self.selected_tags.pop(tag_text, None)
         
         self.refresh_tag_display()
         self.tags_changed.emit(self.available_tags)
     
     def clear_tag_selection(self):
         """Clear all selected tags"""
+        for tag in self.selected_tags:
+            chip = self._chips.get(tag)
+            if chip is not None:
+                chip.set_selected(False)
         self.selected_tags.clear()
-        self.refresh_tag_display()
     
     def emit_apply_to_selection(self):
         """Emit signal to apply selected tags to selection"""
         if self.selected_tags:
-            self.apply_to_selection.emit(self.selected_tags.copy())
+            self.apply_to_selection.emit(list(self.selected_tags))
     
     def emit_apply_to_all(self):
         """Emit signal to apply selected tags to all images"""
         if self.selected_tags:
-            self.apply_to_all.emit(self.selected_tags.copy())
+            self.apply_to_all.emit(list(self.selected_tags))
     
     def get_selected_tags(self) -> list:
         """Get currently selected tags"""
-        return self.selected_tags.copy()
+        return list(self.selected_tags)
 
 
-class TagDisplayWidget(QWidget):
-    """Improved widget for displaying tags in table cells"""
+class TagCellDelegate(QStyledItemDelegate):
+    """Paints an image's tags as chips in the table's Tags column (no per-row widgets)"""
     
     tag_removed = pyqtSignal(str, str)  # filename, tag_text
-    keyword_toggled = pyqtSignal(str)  # tag_text
     
-    def __init__(self, filename: str, tags: list, font_size: int = 11, tag_manager=None):
-        super().__init__()
-        self.filename = filename
-        self.tags = tags.copy()
+    def __init__(self, parent=None, font_size: int = 11, spacing: int = 4, margin: int = 4):
+        super().__init__(parent)
         self.font_size = font_size
+        self.spacing = spacing
+        self.margin = margin
+        self.tag_manager = None  # Will be set by parent
+        self._height_cache = {}  # (tags, width) -> cell height
+    
+    def set_tag_manager(self, tag_manager):
+        """Set the tag manager reference (used for keyword highlighting)"""
         self.tag_manager = tag_manager
-        self.setup_ui()
-        
-    def setup_ui(self):
-        # Use flow widget for better tag arrangement in table cells
-        self.flow_widget = FlowWidget(spacing=4)
-        
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(4, 4, 4, 4)
-        layout.addWidget(self.flow_widget)
-        
-        if not self.tags:
+    
+    def cell_height(self, tags, width: int) -> int:
+        """Height needed to show tags at the given column width, between 40 and 100 pixels"""
+        key = (tags, width)
+        height = self._height_cache.get(key)
+        if height is None:
+            bottom = 0
+            for _, rect in self.chip_rects(QRect(0, 0, width, 0), tags):
+                bottom = max(bottom, rect.bottom() + 1)
+            height = min(100, max(40, bottom + self.margin))
+            if len(self._height_cache) > 4096:
+                self._height_cache.clear()
+            self._height_cache[key] = height
+        return height
+    
+    def sizeHint(self, option, index):
+        """Size from the cached chip flow; rows with the same tags share one computation"""
+        tags = index.data(Qt.ItemDataRole.UserRole) or ()
+        width = option.rect.width()
+        if width <= 0 and option.widget is not None:
+            width = option.widget.columnWidth(index.column())
+        return QSize(width, self.cell_height(tags, width))
+    
+    def chip_rects(self, cell_rect: QRect, tags):
+        """Yield (tag, chip_rect) for tags flowed left to right within cell_rect"""
+        left = cell_rect.x() + self.margin
+        right = cell_rect.right() - self.margin
+        x, y = left, cell_rect.y() + self.margin
+        row_height = 0
+        for tag in tags:
+            size = TagChip.chip_size(tag, self.font_size, True)
+            if x + size.width() > right and x > left:
+                # Move to next row
+                x = left
+                y += row_height + self.spacing
+                row_height = 0
+            yield tag, QRect(QPoint(x, y), size)
+            x += size.width() + self.spacing
+            row_height = max(row_height, size.height())
+    
+    def tag_at(self, cell_rect: QRect, index, pos: QPoint):
+        """Return (tag, chip_rect) for the chip under pos, or None"""
+        for tag, rect in self.chip_rects(cell_rect, index.data(Qt.ItemDataRole.UserRole) or ()):
+            if rect.contains(pos):
+                return tag, rect
+        return None
+    
+    def paint(self, painter, option, index):
+        """Draw the cell's tags as chips"""
+        # Let the style draw the cell background and selection, but not the text
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+        
+        cell_rect = option.rect
+        tags = index.data(Qt.ItemDataRole.UserRole)
+        painter.save()
+        painter.setClipRect(cell_rect)
+        
+        if not tags:
             # Show placeholder when no tags
-            placeholder = QLabel("No tags")
-            placeholder.setStyleSheet("color: #999; font-style: italic; font-size: 11px;")
-            self.flow_widget.addWidget(placeholder)
+            font = QFont(option.font)
+            font.setItalic(True)
+            font.setPixelSize(11)
+            painter.setFont(font)
+            painter.setPen(QColor(153, 153, 153))  # #999
+            painter.drawText(cell_rect.adjusted(self.margin + 2, 0, -self.margin, 0),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "No tags")
         else:
-            # Show tag chips with smaller font for table display
-            for tag in self.tags:
-                is_keyword = self.tag_manager.is_keyword_tag(tag) if self.tag_manager else False
-                chip = TagChip(tag, removable=True, selectable=False, font_size=self.font_size, 
-                              is_keyword=is_keyword, tag_manager=self.tag_manager)
-                chip.remove_clicked.connect(lambda t=tag: self.tag_removed.emit(self.filename, t))
-                chip.keyword_clicked.connect(self.keyword_toggled.emit)
-                self.flow_widget.addWidget(chip)
-        
-        self.setMinimumHeight(40)
-        self.setMaximumHeight(100)
+            keyword_tag = self.tag_manager.get_keyword_tag() if self.tag_manager else None
+            ratio = painter.device().devicePixelRatioF()
+            bottom = cell_rect.bottom()
+            for tag, rect in self.chip_rects(cell_rect, tags):
+                if rect.top() > bottom:
+                    break
+                pixmap = TagChip.chip_pixmap(tag, rect.size(), self.font_size, True, False,
+                                             tag == keyword_tag, False, False, ratio)
+                painter.drawPixmap(rect.topLeft(), pixmap)
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        """Emit tag_removed when a chip's remove button is clicked"""
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            pos = event.position().toPoint()
+            hit = self.tag_at(option.rect, index, pos)
+            if hit is not None and TagChip.remove_button_rect(hit[1]).contains(pos):
+                filename = index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)[1]
+                self.tag_removed.emit(filename, hit[0])
+                return True
+        return super().editorEvent(event, model, option, index)
 
 
 class GalleryTab(QWidget):
@@ -588,6 +858,13 @@ class GalleryTab(QWidget):
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        
+        # Refit every row once a Tags column resize settles, not on each step of a drag
+        self._row_fit_timer = QTimer(self)
+        self._row_fit_timer.setSingleShot(True)
+        self._row_fit_timer.setInterval(150)
+        self._row_fit_timer.timeout.connect(self.fit_tag_row_heights)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -630,6 +907,13 @@ class GalleryTab(QWidget):
         # Allow the table to stretch horizontally
         self.table.horizontalHeader().setStretchLastSection(True)
         
+        # Tags column is painted by a delegate instead of one widget per row
+        self.table.verticalHeader().setDefaultSectionSize(40)
+        self.tag_delegate = TagCellDelegate(self.table)
+        self.tag_delegate.tag_removed.connect(self.parent.event_handlers.on_tag_removed_from_image)
+        self.table.setItemDelegateForColumn(1, self.tag_delegate)
+        self.table.horizontalHeader().sectionResized.connect(self._on_table_section_resized)
+        
         # Connect table selection signal
         self.table.itemSelectionChanged.connect(self.parent.event_handlers.on_table_select)
         
@@ -717,25 +1001,131 @@ class GalleryTab(QWidget):
         # Add widgets to gallery layout
         gallery_layout.addLayout(control_layout)
         gallery_layout.addWidget(splitter, 1)  # Stretch
+    
+    def fit_tag_row_heights(self, rows=None):
+        """Size table rows to their tag chips (all rows, or just the given ones)"""
+        table = self.table
+        delegate = self.tag_delegate
+        width = table.columnWidth(1)
+        if rows is None:
+            rows = range(table.rowCount())
+        for row in rows:
+            item = table.item(row, 1)
+            tags = (item.data(Qt.ItemDataRole.UserRole) if item else None) or ()
+            height = delegate.cell_height(tags, width)
+            if table.rowHeight(row) != height:
+                table.setRowHeight(row, height)
+    
+    def _on_table_section_resized(self, column, old_size, new_size):
+        """Re-fit the visible rows now and the rest once the Tags column stops resizing"""
+        if column != 1:
+            return
+        table = self.table
+        first = table.rowAt(0)
+        if first >= 0:
+            last = table.rowAt(table.viewport().height() - 1)
+            if last < 0:
+                last = table.rowCount() - 1
+            self.fit_tag_row_heights(range(first, last + 1))
+        self._row_fit_timer.start()
+
+
+class ScopeSelector(QWidget):
+    """An All / Selected radio pair choosing which images a Utils operation applies to"""
+    
+    def __init__(self, all_text: str = "All", selected_text: str = "Selected", parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.all_radio = QRadioButton(all_text)
+        self.selected_radio = QRadioButton(selected_text)
+        self.all_radio.setChecked(True)
+        
+        self.group = QButtonGroup(self)
+        self.group.addButton(self.all_radio)
+        self.group.addButton(self.selected_radio)
+        
+        layout.addWidget(self.all_radio)
+        layout.addWidget(self.selected_radio)
+    
+    def is_all(self) -> bool:
+        """Whether the operation should apply to all images"""
+        return self.all_radio.isChecked()
+    
+    def is_selected(self) -> bool:
+        """Whether the operation should apply to the selected images only"""
+        return self.selected_radio.isChecked()
+    
+    def set_selected_enabled(self, enabled: bool):
+        """Enable or disable the "Selected" option"""
+        self.selected_radio.setEnabled(enabled)
 
 
 class UtilsTab(QWidget):
     """Utilities tab for image processing and augmentation"""
     
+    # One stylesheet for the whole tab, parsed once; widgets are styled by object name
+    # and the scope label by its "state" property (none, all or partial)
+    _STYLESHEET = """
+        QLabel#scopeInfo { font-size: 10px; padding: 2px 6px; margin: 2px; border-radius: 2px; }
+        QLabel#scopeInfo[state="none"] { color: #666; background-color: #f8f8f8; }
+        QLabel#scopeInfo[state="all"] { color: #0066cc; background-color: #e6f3ff; }
+        QLabel#scopeInfo[state="partial"] { color: #009900; background-color: #e6ffe6; }
+        QLabel#scrambleDescription { color: #666; font-size: 11px; font-style: italic; margin-bottom: 10px; }
+        QLabel#testScrambleResult { padding: 8px; background-color: #f9f9f9; border: 1px solid #ddd; border-radius: 4px; }
+        QPushButton#previewScrambleBtn { background-color: #E3F2FD; border: 1px solid #2196F3; }
+        QPushButton#scrambleTagsBtn { background-color: #FFF3E0; border: 1px solid #FF9800; font-weight: bold; }
+    """
+    
+    # Scope label texts, filled in with the image counts
+    _SCOPE_TMPL_NONE = "No selection • %d images total"
+    _SCOPE_TMPL_ALL = "All %d images selected"
+    _SCOPE_TMPL_PARTIAL = "%d of %d selected"
+    
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        
+        # Selection changes arrive in bursts (rubber-band selection), so the scope
+        # display is only updated with the last counts after a short pause
+        self._pending_scope = (0, 0)
+        self._selected_enabled = True  # whether the "selected only" radios are enabled
+        self._last_scope_text = ""
+        self._scope_timer = QTimer(self)
+        self._scope_timer.setSingleShot(True)
+        self._scope_timer.setInterval(50)
+        self._scope_timer.timeout.connect(self._apply_scope_update)
+        
+        self.setStyleSheet(self._STYLESHEET)
         self.setup_ui()
         
     def setup_ui(self):
+        # Assemble the whole widget tree before allowing any repaint
+        self.setUpdatesEnabled(False)
+        
         # Main layout for utils tab
         utils_layout = QVBoxLayout(self)
         
         # Selection scope info (very compact)
         self.scope_info_label = QLabel("No images selected")
-        self.scope_info_label.setStyleSheet("QLabel { color: #666; font-size: 10px; padding: 2px 6px; margin: 2px; background-color: #f8f8f8; border-radius: 2px; }")
+        self.scope_info_label.setObjectName("scopeInfo")
+        self.scope_info_label.setProperty("state", "none")
         self.scope_info_label.setMaximumHeight(20)
-        utils_layout.addWidget(self.scope_info_label)
+        
+        # Progress of the running background operation, shown next to the scope info
+        self.operation_progress = QProgressBar()
+        self.operation_progress.setMaximumHeight(20)
+        self.operation_progress.setVisible(False)
+        self.cancel_operation_btn = QPushButton("Cancel")
+        self.cancel_operation_btn.setMaximumHeight(20)
+        self.cancel_operation_btn.setVisible(False)
+        
+        scope_row_layout = QHBoxLayout()
+        scope_row_layout.addWidget(self.scope_info_label, 1)
+        scope_row_layout.addWidget(self.operation_progress, 1)
+        scope_row_layout.addWidget(self.cancel_operation_btn)
+        utils_layout.addLayout(scope_row_layout)
         
         # Create horizontal splitter for left/right panels
         main_splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -754,22 +1144,11 @@ class UtilsTab(QWidget):
         fix_layout = QVBoxLayout(fix_section)
         
         # Scope selection for Fix Images (horizontal)
-        fix_scope_layout = QHBoxLayout()
-        self.fix_scope_group = QButtonGroup()
-        self.fix_all_radio = QRadioButton("All")
-        self.fix_selected_radio = QRadioButton("Selected")
-        self.fix_all_radio.setChecked(True)
-        
-        self.fix_scope_group.addButton(self.fix_all_radio)
-        self.fix_scope_group.addButton(self.fix_selected_radio)
-        
-        fix_scope_layout.addWidget(self.fix_all_radio)
-        fix_scope_layout.addWidget(self.fix_selected_radio)
-        fix_layout.addLayout(fix_scope_layout)
+        self.fix_scope = ScopeSelector()
+        fix_layout.addWidget(self.fix_scope)
         
         # Fix Images button
         self.fix_images_btn = QPushButton("Fix Images")
-        self.fix_images_btn.clicked.connect(self.parent.event_handlers.fix_images)
         fix_layout.addWidget(self.fix_images_btn)
         
         processing_layout.addWidget(fix_section)
@@ -779,28 +1158,17 @@ class UtilsTab(QWidget):
         rename_layout = QVBoxLayout(rename_section)
         
         # Scope selection for Mass Rename (horizontal)
-        rename_scope_layout = QHBoxLayout()
-        self.rename_scope_group = QButtonGroup()
-        self.rename_all_radio = QRadioButton("All")
-        self.rename_selected_radio = QRadioButton("Selected")
-        self.rename_all_radio.setChecked(True)
-        
-        self.rename_scope_group.addButton(self.rename_all_radio)
-        self.rename_scope_group.addButton(self.rename_selected_radio)
-        
-        rename_scope_layout.addWidget(self.rename_all_radio)
-        rename_scope_layout.addWidget(self.rename_selected_radio)
-        rename_layout.addLayout(rename_scope_layout)
+        self.rename_scope = ScopeSelector()
+        rename_layout.addWidget(self.rename_scope)
         
         # Prefix input
-        prefix_layout = QHBoxLayout()
-        prefix_label = QLabel("Prefix:")
         self.prefix_entry = QLineEdit()
         self.prefix_entry.setPlaceholderText("e.g., 'portrait_'")
         
-        prefix_layout.addWidget(prefix_label)
-        prefix_layout.addWidget(self.prefix_entry, 1)
-        rename_layout.addLayout(prefix_layout)
+        prefix_form = QFormLayout()
+        prefix_form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.AllNonFixedFieldsGrow)
+        prefix_form.addRow("Prefix:", self.prefix_entry)
+        rename_layout.addLayout(prefix_form)
         
         # NEW: Scramble order checkbox
         self.scramble_order_checkbox = QCheckBox("Scramble image order (adds random letters)")
@@ -809,7 +1177,6 @@ class UtilsTab(QWidget):
         
         # Rename button
         self.mass_rename_btn = QPushButton("Rename Images")
-        self.mass_rename_btn.clicked.connect(self.parent.event_handlers.mass_rename_images)
         rename_layout.addWidget(self.mass_rename_btn)
         
         processing_layout.addWidget(rename_section)
@@ -819,22 +1186,11 @@ class UtilsTab(QWidget):
         augment_layout = QVBoxLayout(augment_section)
         
         # Scope selection for Duplicates (horizontal)
-        dup_scope_layout = QHBoxLayout()
-        self.dup_scope_group = QButtonGroup()
-        self.dup_all_radio = QRadioButton("All")
-        self.dup_selected_radio = QRadioButton("Selected")
-        self.dup_all_radio.setChecked(True)
-        
-        self.dup_scope_group.addButton(self.dup_all_radio)
-        self.dup_scope_group.addButton(self.dup_selected_radio)
-        
-        dup_scope_layout.addWidget(self.dup_all_radio)
-        dup_scope_layout.addWidget(self.dup_selected_radio)
-        augment_layout.addLayout(dup_scope_layout)
+        self.dup_scope = ScopeSelector()
+        augment_layout.addWidget(self.dup_scope)
         
         # Create Duplicates button
         self.create_duplicates_btn = QPushButton("Create Duplicates")
-        self.create_duplicates_btn.clicked.connect(self.parent.event_handlers.create_duplicates)
         augment_layout.addWidget(self.create_duplicates_btn)
         
         processing_layout.addWidget(augment_section)
@@ -843,7 +1199,55 @@ class UtilsTab(QWidget):
         left_layout.addWidget(processing_group)
         left_layout.addStretch()
         
-        # Right panel - Tag Processing
+        # The scramble scope joins when the right panel is built
+        self._scopes = [self.fix_scope, self.rename_scope, self.dup_scope]
+        
+        handlers = self.parent.event_handlers
+        for button, slot in ((self.cancel_operation_btn, handlers.cancel_image_operation),
+                             (self.fix_images_btn, handlers.fix_images),
+                             (self.mass_rename_btn, handlers.mass_rename_images),
+                             (self.create_duplicates_btn, handlers.create_duplicates)):
+            button.clicked.connect(slot)
+        
+        # Add panels to splitter; the right panel is filled in when the tab is first shown
+        self._right_container = QWidget()
+        right_container_layout = QVBoxLayout(self._right_container)
+        right_container_layout.setContentsMargins(0, 0, 0, 0)
+        self._right_panel = None
+        
+        for panel in (left_panel, self._right_container):
+            panel.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            main_splitter.addWidget(panel)
+        self.main_splitter = main_splitter
+        
+        # Split 40% left, 60% right from the first layout pass
+        main_splitter.setStretchFactor(0, 2)
+        main_splitter.setStretchFactor(1, 3)
+        
+        self.setUpdatesEnabled(True)
+    
+    def showEvent(self, event):
+        self._ensure_right_panel_built()
+        super().showEvent(event)
+    
+    def _ensure_right_panel_built(self):
+        """Build the tag scrambling panel into its splitter slot, once"""
+        if self._right_panel is not None:
+            return
+        self._right_container.setUpdatesEnabled(False)
+        self._right_panel = self._build_right_panel()
+        self._right_container.layout().addWidget(self._right_panel)
+        # The splitter was first laid out around the empty slot; share its width out 2:3 once,
+        # before the first paint, and let the stretch factors keep that ratio on resize
+        width = self.main_splitter.width()
+        self.main_splitter.setSizes([width * 2 // 5, width * 3 // 5])
+        # Catch up with any scope updates applied before the panel existed
+        self.scramble_scope.set_selected_enabled(self._selected_enabled)
+        self._scopes.append(self.scramble_scope)
+        self._right_container.setUpdatesEnabled(True)
+    
+    def _build_right_panel(self):
+        """Create the Tag Processing panel"""
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
         
@@ -853,41 +1257,22 @@ class UtilsTab(QWidget):
         
         # Description
         desc_label = QLabel("Randomize the order of tags in descriptions to create variety while preserving all content.")
-        desc_label.setStyleSheet("QLabel { color: #666; font-size: 11px; font-style: italic; margin-bottom: 10px; }")
+        desc_label.setObjectName("scrambleDescription")
         desc_label.setWordWrap(True)
         scramble_layout.addWidget(desc_label)
         
         # Scope selection for Tag Scrambling
-        scramble_scope_layout = QHBoxLayout()
-        self.scramble_scope_group = QButtonGroup()
-        self.scramble_all_radio = QRadioButton("Scramble All Descriptions")
-        self.scramble_selected_radio = QRadioButton("Scramble Selected Only")
-        self.scramble_all_radio.setChecked(True)
-        
-        self.scramble_scope_group.addButton(self.scramble_all_radio)
-        self.scramble_scope_group.addButton(self.scramble_selected_radio)
-        
-        scramble_scope_layout.addWidget(self.scramble_all_radio)
-        scramble_scope_layout.addWidget(self.scramble_selected_radio)
-        scramble_layout.addLayout(scramble_scope_layout)
+        self.scramble_scope = ScopeSelector("Scramble All Descriptions", "Scramble Selected Only")
+        scramble_layout.addWidget(self.scramble_scope)
         
         # Options section
         options_group = QGroupBox("Scrambling Options")
         options_layout = QVBoxLayout(options_group)
         
-        # Preserve first tag option
-        self.preserve_first_tag = QRadioButton("Preserve first tag (keep main subject first)")
-        self.preserve_first_tag.setChecked(True)
-        options_layout.addWidget(self.preserve_first_tag)
-        
-        # Full randomization option
-        self.full_randomize = QRadioButton("Fully randomize all tags")
-        options_layout.addWidget(self.full_randomize)
-        
-        # Group the radio buttons
-        self.scramble_method_group = QButtonGroup()
-        self.scramble_method_group.addButton(self.preserve_first_tag)
-        self.scramble_method_group.addButton(self.full_randomize)
+        # Scrambling method; index 0 keeps the first tag in place, index 1 shuffles everything
+        self.scramble_method_combo = QComboBox()
+        self.scramble_method_combo.addItems(["Preserve first tag (keep main subject first)", "Fully randomize all tags"])
+        options_layout.addWidget(self.scramble_method_combo)
         
         scramble_layout.addWidget(options_group)
         
@@ -895,23 +1280,22 @@ class UtilsTab(QWidget):
         test_group = QGroupBox("Test Scrambling")
         test_layout = QVBoxLayout(test_group)
         
-        test_input_layout = QHBoxLayout()
-        test_input_layout.addWidget(QLabel("Test tags:"))
         self.test_tags_entry = QLineEdit()
         self.test_tags_entry.setPlaceholderText("Enter test tags: tag1, tag2, tag3, tag4...")
         self.test_scramble_btn = QPushButton("Test Scramble")
-        self.test_scramble_btn.clicked.connect(self.parent.event_handlers.test_tag_scramble)
         
+        # The entry and its button share the field side of one form row
+        test_input_layout = QHBoxLayout()
         test_input_layout.addWidget(self.test_tags_entry, 1)
         test_input_layout.addWidget(self.test_scramble_btn)
-        test_layout.addLayout(test_input_layout)
+        test_form = QFormLayout()
+        test_form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.AllNonFixedFieldsGrow)
+        test_form.addRow("Test tags:", test_input_layout)
+        test_layout.addLayout(test_form)
         
-        # Test result display
-        self.test_scramble_result = QLabel("Results will appear here...")
-        self.test_scramble_result.setWordWrap(True)
-        self.test_scramble_result.setStyleSheet("QLabel { padding: 8px; background-color: #f9f9f9; border: 1px solid #ddd; border-radius: 4px; }")
-        self.test_scramble_result.setMinimumHeight(60)
-        test_layout.addWidget(self.test_scramble_result)
+        # Test result display, created by show_test_scramble_result on the first test
+        self.test_scramble_result = None
+        self._test_layout = test_layout
         
         scramble_layout.addWidget(test_group)
         
@@ -920,16 +1304,14 @@ class UtilsTab(QWidget):
         
         # Preview button
         self.preview_scramble_btn = QPushButton("Preview Changes")
-        self.preview_scramble_btn.setStyleSheet("QPushButton { background-color: #E3F2FD; border: 1px solid #2196F3; }")
-        self.preview_scramble_btn.clicked.connect(self.parent.event_handlers.preview_tag_scramble)
+        self.preview_scramble_btn.setObjectName("previewScrambleBtn")
         button_layout.addWidget(self.preview_scramble_btn)
         
         button_layout.addStretch()
         
         # Apply button
         self.scramble_tags_btn = QPushButton("Scramble Tags")
-        self.scramble_tags_btn.setStyleSheet("QPushButton { background-color: #FFF3E0; border: 1px solid #FF9800; font-weight: bold; }")
-        self.scramble_tags_btn.clicked.connect(self.parent.event_handlers.scramble_tags)
+        self.scramble_tags_btn.setObjectName("scrambleTagsBtn")
         button_layout.addWidget(self.scramble_tags_btn)
         
         scramble_layout.addLayout(button_layout)
@@ -938,41 +1320,79 @@ class UtilsTab(QWidget):
         right_layout.addWidget(scramble_group)
         right_layout.addStretch()
         
-        # Add panels to splitter
-        main_splitter.addWidget(left_panel)
-        main_splitter.addWidget(right_panel)
+        handlers = self.parent.event_handlers
+        for button, slot in ((self.test_scramble_btn, handlers.test_tag_scramble),
+                             (self.preview_scramble_btn, handlers.preview_tag_scramble),
+                             (self.scramble_tags_btn, handlers.scramble_tags)):
+            button.clicked.connect(slot)
         
-        # Set initial splitter sizes (40% left, 60% right)
-        main_splitter.setSizes([400, 600])
+        return right_panel
+    
+    def show_test_scramble_result(self, text: str):
+        """Show text in the test scrambling result label, creating the label on first use"""
+        if self.test_scramble_result is None:
+            self.test_scramble_result = QLabel()
+            self.test_scramble_result.setWordWrap(True)
+            self.test_scramble_result.setObjectName("testScrambleResult")
+            self.test_scramble_result.setMinimumHeight(60)
+            self._test_layout.addWidget(self.test_scramble_result)
+        self.test_scramble_result.setText(text)
+    
+    def set_operation_running(self, running: bool):
+        """Lock the image operation buttons and show progress while a background operation runs"""
+        for btn in (self.fix_images_btn, self.mass_rename_btn, self.create_duplicates_btn):
+            btn.setEnabled(not running)
+        if running:
+            self.operation_progress.setRange(0, 0)  # busy indicator until the first progress report
+        self.operation_progress.setVisible(running)
+        self.cancel_operation_btn.setVisible(running)
+    
+    def set_operation_progress(self, done: int, total: int):
+        """Show how many images the background operation has handled"""
+        self.operation_progress.setRange(0, total)
+        self.operation_progress.setValue(done)
     
     def update_scope_info(self, selected_count, total_count):
-        """Update the scope information display"""
+        """Schedule an update of the scope information display"""
+        self._pending_scope = (selected_count, total_count)
+        self._scope_timer.start()
+    
+    def _set_scope_state(self, state):
+        """Switch the scope label's style rule; the stylesheet itself is never re-parsed"""
+        label = self.scope_info_label
+        if label.property("state") != state:
+            label.setProperty("state", state)
+            style = label.style()
+            style.unpolish(label)
+            style.polish(label)
+    
+    def _set_selected_enabled(self, enabled: bool):
+        """Enable or disable the "selected only" scope options together"""
+        # The state only flips when the selection becomes empty or non-empty
+        if enabled == self._selected_enabled:
+            return
+        self._selected_enabled = enabled
+        
+        for scope in self._scopes:
+            scope.set_selected_enabled(enabled)
+    
+    def _apply_scope_update(self):
+        """Update the scope information display from the latest counts"""
+        selected_count, total_count = self._pending_scope
         if selected_count == 0:
-            self.scope_info_label.setText(f"No selection • {total_count} images total")
-            self.scope_info_label.setStyleSheet("QLabel { color: #666; font-size: 10px; padding: 2px 6px; margin: 2px; background-color: #f8f8f8; border-radius: 2px; }")
-            
-            # Disable "selected only" options when nothing is selected
-            self.fix_selected_radio.setEnabled(False)
-            self.rename_selected_radio.setEnabled(False)
-            self.dup_selected_radio.setEnabled(False)
-            self.scramble_selected_radio.setEnabled(False)
-            
+            text, state = self._SCOPE_TMPL_NONE % total_count, 'none'
         elif selected_count == total_count:
-            self.scope_info_label.setText(f"All {total_count} images selected")
-            self.scope_info_label.setStyleSheet("QLabel { color: #0066cc; font-size: 10px; padding: 2px 6px; margin: 2px; background-color: #e6f3ff; border-radius: 2px; }")
-            
-            # Enable "selected only" options
-            self.fix_selected_radio.setEnabled(True)
-            self.rename_selected_radio.setEnabled(True)
-            self.dup_selected_radio.setEnabled(True)
-            self.scramble_selected_radio.setEnabled(True)
-            
+            text, state = self._SCOPE_TMPL_ALL % total_count, 'all'
         else:
-            self.scope_info_label.setText(f"{selected_count} of {total_count} selected")
-            self.scope_info_label.setStyleSheet("QLabel { color: #009900; font-size: 10px; padding: 2px 6px; margin: 2px; background-color: #e6ffe6; border-radius: 2px; }")
-            
-            # Enable "selected only" options
-            self.fix_selected_radio.setEnabled(True)
-            self.rename_selected_radio.setEnabled(True)
-            self.dup_selected_radio.setEnabled(True)
-            self.scramble_selected_radio.setEnabled(True)
\ No newline at end of file
+            text, state = self._SCOPE_TMPL_PARTIAL % (selected_count, total_count), 'partial'
+        
+        # The text encodes both counts, so an unchanged text means nothing else changed either
+        if text == self._last_scope_text:
+            return
+        self._last_scope_text = text
+        
+        self.scope_info_label.setText(text)
+        self._set_scope_state(state)
+        
+        # "Selected only" options make sense only when something is selected
+        self._set_selected_enabled(selected_count > 0)
\ No newline at end of file